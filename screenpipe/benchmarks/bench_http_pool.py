@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Per-call latency benchmark: fresh httpx client per tool call vs the shared connection pool
+Runs against a local keep-alive HTTP server so no Screenpipe daemon is needed
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp"))
+
+from screenpipe_client import close_client, create_client, get_client  # noqa: E402
+
+SEARCH_BODY = json.dumps({
+    "data": [
+        {"type": "OCR", "content": {"text": "benchmark frame", "app_name": "Code", "timestamp": "2024-01-01T00:00:00Z"}}
+    ] * 10,
+    "pagination": {"limit": 10, "offset": 0, "total": 10},
+}).encode()
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    """Minimal /search endpoint that keeps connections alive"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(SEARCH_BODY)))
+        self.end_headers()
+        self.wfile.write(SEARCH_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SearchHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+async def call_per_request_client(url):
+    """Old pattern: every tool call opens and closes its own client"""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{url}/search", params={"q": "bench"}, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+
+
+async def call_pooled_client(url):
+    """New pattern: every tool call borrows the shared pooled client"""
+    response = await get_client().get(f"{url}/search", params={"q": "bench"}, timeout=30.0)
+    response.raise_for_status()
+    return response.json()
+
+
+async def measure(call, url, iterations, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    # Warm up once so import and DNS costs are not counted
+    await call(url)
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(iterations)))
+    wall = time.perf_counter() - wall_started
+
+    latencies.sort()
+    return {
+        "calls": iterations,
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "calls_per_s": round(iterations / wall, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-call vs pooled Screenpipe HTTP clients')
+    parser.add_argument('--iterations', type=int, default=500, help='Tool calls per mode (default: 500)')
+    parser.add_argument('--concurrency', type=int, default=1, help='Concurrent tool calls (default: 1)')
+    parser.add_argument('--url', type=str, help='Use an existing Screenpipe API instead of the built-in server')
+    args = parser.parse_args()
+
+    httpd = None
+    url = args.url
+    if not url:
+        httpd, url = start_server()
+
+    create_client()
+    try:
+        before = await measure(call_per_request_client, url, args.iterations, args.concurrency)
+        after = await measure(call_pooled_client, url, args.iterations, args.concurrency)
+    finally:
+        await close_client()
+        if httpd:
+            httpd.shutdown()
+
+    print(f"Target: {url}  iterations={args.iterations}  concurrency={args.concurrency}\n")
+    print(f"{'mode':<22}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'calls/s':>10}")
+    for label, stats in (("client per call", before), ("shared pool", after)):
+        print(f"{label:<22}{stats['mean_ms']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['calls_per_s']:>10}")
+    if after["mean_ms"]:
+        print(f"\nSpeedup (mean latency): {before['mean_ms'] / after['mean_ms']:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
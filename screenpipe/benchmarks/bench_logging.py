@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Log throughput benchmark: open/append/close per message vs the buffered background writer
+Measures how long the caller is held up per message and how long until every line is on disk
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp"))
+
+from screenpipe_logging import BufferedLogWriter  # noqa: E402
+
+MESSAGE = "Tool called: search-content with args: {'query': 'benchmark', 'limit': 10}"
+
+
+def open_per_call(log_file: Path, count: int) -> list[float]:
+    """The previous log_to_file: one open/append/close per message"""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(log_file, "a") as f:
+            f.write(f"[{timestamp}] {MESSAGE}\n")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def buffered(writer: BufferedLogWriter, count: int) -> list[float]:
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        writer.write(MESSAGE)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def summarize(latencies: list[float], total_seconds: float, count: int) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "caller_us": round(statistics.fmean(ordered) * 1e6, 2),
+        "p99_us": round(ordered[int(len(ordered) * 0.99) - 1] * 1e6, 2),
+        "msgs_per_s": round(count / total_seconds) if total_seconds else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-message file logging vs the buffered log writer')
+    parser.add_argument('--messages', type=int, default=100_000, help='Messages to log per mode (default: 100000)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct_file = Path(tmp) / "direct.log"
+        started = time.perf_counter()
+        before = summarize(open_per_call(direct_file, args.messages), time.perf_counter() - started, args.messages)
+
+        # The buffer is sized to hold the whole run so every line is written and the comparison is fair
+        writer = BufferedLogWriter(Path(tmp) / "buffered.log", max_bytes=0, max_buffer=args.messages + 1)
+        started = time.perf_counter()
+        latencies = buffered(writer, args.messages)
+        writer.close(timeout=60)
+        after = summarize(latencies, time.perf_counter() - started, args.messages)
+
+        lines = sum(1 for _ in open(Path(tmp) / "buffered.log"))
+        if lines != args.messages:
+            print(f"warning: buffered log has {lines} lines, expected {args.messages}")
+
+    print(f"messages={args.messages}  (msgs/s includes flushing every line to disk)\n")
+    print(f"{'mode':<20}{'caller us':>12}{'p99 us':>10}{'msgs/s':>12}")
+    for label, stats in (("open per call", before), ("buffered writer", after)):
+        print(f"{label:<20}{stats['caller_us']:>12}{stats['p99_us']:>10}{stats['msgs_per_s']:>12}")
+    if after["caller_us"]:
+        print(f"\nSpeedup (caller time per message): {before['caller_us'] / after['caller_us']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
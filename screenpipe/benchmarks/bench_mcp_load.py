@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Concurrent load generator for the Screenpipe MCP servers, speaking MCP over stdio
+Starts the fake Screenpipe API (or uses --port), spawns one server process and issues a weighted
+mix of tool calls at a target rate with bounded concurrency, the way several agents sharing one
+server would. Reports throughput, latency percentiles and error rates per tool.
+
+    python bench_mcp_load.py --server main --rate 20 --concurrency 8 --duration 30
+    python bench_mcp_load.py --server stable --rate 0 --concurrency 16 --calls 500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+BENCHMARKS_PATH = Path(__file__).resolve().parent
+MCP_PATH = BENCHMARKS_PATH.parent / "mcp"
+sys.path.insert(0, str(MCP_PATH))
+
+from fake_screenpipe import add_fake_arguments, fake_from_args  # noqa: E402
+from screenpipe_metrics import ERROR_PREFIXES, percentile  # noqa: E402
+
+# Server profiles by short name; all of them are screenpipe_server.py with a set of tool groups
+SERVERS = {
+    "main": "screenpipe_server.py",
+    "stable": "screenpipe_server_stable.py",
+    "simple": "screenpipe_server_simple.py",
+    "terminal": "screenpipe_server_with_terminal.py",
+}
+
+DEFAULT_MIX = "search-content=6,analyze-productivity=1,find-coding-sessions=1,export-daily-summary=1"
+
+# Arguments sent with each tool unless overridden with --tool-args
+DEFAULT_ARGUMENTS = {
+    "search-content": {"q": "python", "limit": 10},
+    "analyze-productivity": {"hours_back": 2},
+    "find-coding-sessions": {"hours_back": 4},
+    "export-daily-summary": {"format": "json"},
+    "batch-search": {"queries": [{"q": "python"}, {"q": "meeting"}, {"app_name": "Slack"}]},
+    "server-metrics": {},
+    "get-health": {},
+    "test-connection": {},
+}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """"search-content=6,analyze-productivity=1" -> {tool: weight}"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip():
+            mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def parse_tool_arguments(values: list[str] | None) -> dict[str, dict]:
+    """Parse repeated --tool-args NAME=JSON values"""
+    arguments = {}
+    for value in values or []:
+        name, sep, payload = value.partition("=")
+        if not sep:
+            raise ValueError(f"expected NAME=JSON, got {value!r}")
+        arguments[name.strip()] = json.loads(payload)
+    return arguments
+
+
+def is_error(result) -> bool:
+    if result.isError:
+        return True
+    texts = [getattr(item, "text", "") or "" for item in result.content]
+    return bool(texts) and texts[0].lower().lstrip("❌ ").startswith(ERROR_PREFIXES)
+
+
+class LoadStats:
+    """Latencies and failures per tool"""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.last_error: dict[str, str] = {}
+
+    def record(self, tool: str, seconds: float, error: str | None = None):
+        self.latencies.setdefault(tool, []).append(seconds)
+        self.errors.setdefault(tool, 0)
+        if error is not None:
+            self.errors[tool] += 1
+            self.last_error[tool] = error[:200]
+
+    def summary(self, tool: str | None = None) -> dict:
+        if tool is None:
+            latencies = sorted(value for values in self.latencies.values() for value in values)
+            errors = sum(self.errors.values())
+        else:
+            latencies = sorted(self.latencies.get(tool, []))
+            errors = self.errors.get(tool, 0)
+        return {
+            "calls": len(latencies),
+            "errors": errors,
+            "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+            "p90_ms": round(percentile(latencies, 0.90) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
+
+
+async def call_tool(session: ClientSession, stats: LoadStats, tool: str, arguments: dict, timeout: float, scheduled: float):
+    """One call; latency counts from when it was scheduled, so time spent queued behind the
+    concurrency limit is included rather than hidden"""
+    try:
+        result = await session.call_tool(tool, arguments, read_timeout_seconds=timedelta(seconds=timeout))
+        error = None
+        if is_error(result):
+            error = (getattr(result.content[0], "text", "") if result.content else "") or "error result"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    stats.record(tool, time.perf_counter() - scheduled, error)
+
+
+async def generate_load(session: ClientSession, mix: dict, arguments: dict, args) -> tuple[LoadStats, float]:
+    stats = LoadStats()
+    chooser = random.Random(args.seed)
+    tools, weights = list(mix), list(mix.values())
+    semaphore = asyncio.Semaphore(max(args.concurrency, 1))
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    def more(issued: int) -> bool:
+        if args.calls and issued >= args.calls:
+            return False
+        return deadline is None or time.perf_counter() < deadline
+
+    started = time.perf_counter()
+    if args.rate > 0:
+        # Open loop: calls are issued on schedule whether or not earlier ones have finished
+        pending = set()
+        issued = 0
+        while more(issued):
+            scheduled = started + issued / args.rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tool = chooser.choices(tools, weights)[0]
+
+            async def limited(tool=tool, scheduled=scheduled):
+                async with semaphore:
+                    await call_tool(session, stats, tool, arguments.get(tool, {}), args.call_timeout, scheduled)
+
+            task = asyncio.create_task(limited())
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            issued += 1
+        await asyncio.gather(*pending)
+    else:
+        # Closed loop: each of `concurrency` agents calls again as soon as its last call returns
+        issued = 0
+
+        async def agent():
+            nonlocal issued
+            while more(issued):
+                issued += 1
+                tool = chooser.choices(tools, weights)[0]
+                await call_tool(session, stats, tool, arguments.get(tool, {}), args.call_timeout, time.perf_counter())
+
+        await asyncio.gather(*(agent() for _ in range(max(args.concurrency, 1))))
+    return stats, time.perf_counter() - started
+
+
+def format_report(stats: LoadStats, elapsed: float, args, label: str) -> str:
+    overall = stats.summary()
+    target = f"target {args.rate:g}/s" if args.rate > 0 else "closed loop"
+    lines = [
+        f"{label}: {args.concurrency} concurrent, {target}, {overall['calls']} calls in {elapsed:.1f}s",
+        "",
+        f"{'tool':<24}{'calls':>7}{'errors':>8}{'err %':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    for tool in sorted(stats.latencies) + [None]:
+        row = stats.summary(tool)
+        lines.append(
+            f"{tool or 'all':<24}{row['calls']:>7}{row['errors']:>8}{row['error_rate'] * 100:>7.1f}"
+            f"{row['p50_ms']:>10}{row['p90_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}"
+        )
+    throughput = overall["calls"] / elapsed if elapsed else 0.0
+    lines.append(f"\nThroughput: {throughput:.1f} calls/s")
+    if args.rate > 0 and throughput < args.rate * 0.95:
+        lines.append(f"Saturated: completed {throughput:.1f}/s of the {args.rate:g}/s offered")
+    for tool, error in sorted(stats.last_error.items()):
+        lines.append(f"Last error from {tool}: {error}")
+    return "\n".join(lines)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Concurrent MCP stdio load generator for the Screenpipe servers')
+    parser.add_argument('--server', type=str, default="main",
+                        help=f'Server to run: {", ".join(SERVERS)} or a path to a server script (default: main)')
+    parser.add_argument('--tool-groups', type=str, help='Tool groups to enable in the server, e.g. "all" (default: the profile\'s own)')
+    parser.add_argument('--server-arg', action='append', default=[], help='Extra argument for the server (repeatable)')
+    parser.add_argument('--port', type=int, help='Use a Screenpipe API already on this port instead of starting the fake')
+    parser.add_argument('--tool-mix', type=str, default=DEFAULT_MIX, help=f'Tool weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--tool-args', action='append', help='Arguments for one tool as NAME=JSON (repeatable)')
+    parser.add_argument('--rate', type=float, default=10, help='Calls per second to offer; 0 runs closed loop (default: 10)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Most calls in flight at once (default: 8)')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to generate load; 0 for no limit (default: 30)')
+    parser.add_argument('--calls', type=int, default=0, help='Stop after this many calls; 0 for no limit (default: 0)')
+    parser.add_argument('--call-timeout', type=float, default=60, help='Seconds before a call counts as failed (default: 60)')
+    parser.add_argument('--json', type=str, help='Also write the results to this file')
+    add_fake_arguments(parser)
+    args = parser.parse_args()
+    if not args.duration and not args.calls:
+        parser.error("one of --duration or --calls must be set")
+
+    # Scripts given by path may not be screenpipe_server.py profiles, so they only get --port
+    script = SERVERS.get(args.server, args.server)
+    takes_server_options = args.server in SERVERS
+    script_path = Path(script) if Path(script).is_absolute() or Path(script).exists() else MCP_PATH / script
+    arguments = {**DEFAULT_ARGUMENTS, **parse_tool_arguments(args.tool_args)}
+
+    fake = None
+    port = args.port
+    if port is None:
+        fake = fake_from_args(args).start()
+        port = fake.port
+
+    with tempfile.TemporaryDirectory() as data_dir, open(Path(data_dir) / "server_stderr.log", "w") as errlog:
+        server_args = [str(script_path), "--port", str(port)]
+        if takes_server_options:
+            server_args += ["--data-dir", data_dir]
+        if args.tool_groups:
+            server_args += ["--tool-groups", args.tool_groups]
+        parameters = StdioServerParameters(command=sys.executable, args=server_args + args.server_arg, cwd=str(MCP_PATH))
+        try:
+            spawned = time.perf_counter()
+            async with stdio_client(parameters, errlog=errlog) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    offered = {tool.name for tool in (await session.list_tools()).tools}
+                    # Cold start as a client sees it: spawn to a usable tool list
+                    startup = time.perf_counter() - spawned
+                    mix = {tool: weight for tool, weight in parse_mix(args.tool_mix).items() if weight > 0}
+                    missing = sorted(set(mix) - offered)
+                    if missing:
+                        print(f"Skipping tools {script_path.name} does not offer: {', '.join(missing)}")
+                    mix = {tool: weight for tool, weight in mix.items() if tool in offered}
+                    if not mix:
+                        print("No tools left to call")
+                        return
+                    stats, elapsed = await generate_load(session, mix, arguments, args)
+        finally:
+            if fake:
+                fake.shutdown()
+
+    label = f"{script_path.name} against {'fake ' + str(args.frames) + ' frames' if fake else 'port ' + str(port)}"
+    print(format_report(stats, elapsed, args, label))
+    print(f"Startup: {startup * 1000:.0f} ms to initialize and list {len(offered)} tools")
+    if args.json:
+        report = {
+            "server": script_path.name,
+            "rate": args.rate,
+            "concurrency": args.concurrency,
+            "startup_s": round(startup, 3),
+            "elapsed_s": round(elapsed, 3),
+            "throughput": round(stats.summary()["calls"] / elapsed, 2) if elapsed else 0.0,
+            "tools": {tool: stats.summary(tool) for tool in sorted(stats.latencies)},
+            "all": stats.summary(),
+            "upstream": fake.requests if fake else None,
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
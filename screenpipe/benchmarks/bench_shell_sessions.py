@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Terminal command benchmark: a new shell per command vs persistent shell sessions
+Runs the same command through execute-terminal-command's spawn-per-command path (osascript
+`do shell script` on macOS, /bin/sh elsewhere) and through the shell session pool, and
+reports per-command latency and throughput for each.
+
+    python bench_shell_sessions.py --commands 500
+    python bench_shell_sessions.py --command "git status --short" --concurrency 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp"))
+
+from screenpipe_metrics import percentile  # noqa: E402
+from screenpipe_shell import ShellPool  # noqa: E402
+from screenpipe_terminal_tools import execute_terminal_command  # noqa: E402
+
+
+async def run_commands(command: str, count: int, concurrency: int, timeout: float, shells=None) -> tuple[list[float], float, str]:
+    """Run command count times over concurrency workers; returns (latencies, elapsed, method)"""
+    latencies = []
+    methods = set()
+    remaining = iter(range(count))
+
+    async def worker(index: int):
+        for _ in remaining:
+            started = time.perf_counter()
+            result = await execute_terminal_command(command, timeout, shells=shells, session=f"bench-{index}")
+            latencies.append(time.perf_counter() - started)
+            if not result["success"]:
+                raise RuntimeError(f"{command!r} failed: {result['error']}")
+            methods.add(result["method"].split(" '")[0])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return latencies, time.perf_counter() - started, ", ".join(sorted(methods))
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "commands_per_s": round(len(ordered) / elapsed, 1) if elapsed else 0,
+    }
+
+
+async def run(args):
+    latencies, elapsed, spawn_method = await run_commands(args.command, args.commands, args.concurrency, args.timeout)
+    spawn = summarize(latencies, elapsed)
+
+    shells = ShellPool(max_sessions=args.concurrency)
+    try:
+        # Start the sessions first: the pool pays the shell start-up once, not per command
+        await run_commands("true", args.concurrency, args.concurrency, args.timeout, shells=shells)
+        latencies, elapsed, _ = await run_commands(args.command, args.commands, args.concurrency, args.timeout, shells=shells)
+        pooled = summarize(latencies, elapsed)
+    finally:
+        await shells.close()
+
+    print(f"command={args.command!r}  commands={args.commands}  concurrency={args.concurrency}\n")
+    print(f"{'mode':<36}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'cmds/s':>10}")
+    for label, stats in ((f"spawn per command ({spawn_method})", spawn), ("shell sessions", pooled)):
+        print(f"{label:<36}{stats['mean_ms']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+              f"{stats['p99_ms']:>10}{stats['commands_per_s']:>10}")
+    if pooled["mean_ms"]:
+        print(f"\nSpeedup (mean latency per command): {spawn['mean_ms'] / pooled['mean_ms']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark spawn-per-command terminal execution vs persistent shell sessions')
+    parser.add_argument('--command', type=str, default='echo hello', help='Shell command to run (default: "echo hello")')
+    parser.add_argument('--commands', type=int, default=200, help='Commands to run per mode (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Commands in flight at once; the session mode uses one session per worker (default: 1)')
+    parser.add_argument('--timeout', type=float, default=30, help='Timeout per command in seconds (default: 30)')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Per-tool benchmark of the Screenpipe MCP server against the fake Screenpipe API
+For each history size the fake is started in this process and every tool runs in a fresh worker
+process that imports the server and calls handle_call_tool directly, so peak RSS is the tool's own.
+Results go to a JSON baseline; pass an earlier one with --baseline to flag regressions.
+
+    python bench_tools.py --sizes 1000,100000 --output baseline.json
+    python bench_tools.py --sizes 1000,100000 --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BENCHMARKS_PATH = Path(__file__).resolve().parent
+MCP_PATH = BENCHMARKS_PATH.parent / "mcp"
+sys.path.insert(0, str(MCP_PATH))
+
+from fake_screenpipe import SyntheticFrames, FakeScreenpipe  # noqa: E402
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+DEFAULT_TOOLS = "search-content,analyze-productivity,find-coding-sessions,export-daily-summary"
+
+# Raw tool cost: no local mirror, rollups or result cache in front of the upstream
+SERVER_ARGS = ["--no-index", "--no-rollup", "--no-cache", "--tool-groups", "all"]
+
+# Relative slowdown (or RSS growth) over the baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.20
+
+# Smaller absolute changes are noise, whatever their ratio (seconds, MB)
+MIN_CHANGE = {"wall_s": 0.02, "peak_rss_mb": 5.0}
+
+
+def tool_arguments(tool: str, hours: float, now: datetime) -> dict:
+    """Arguments that make each tool cover the whole synthetic history"""
+    if tool == "search-content":
+        return {"q": "python", "limit": 50, "start_time": (now - timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+    if tool == "export-daily-summary":
+        # The day holding most of the history (the fake's history ends now)
+        busiest = now - timedelta(hours=min(hours, 24) / 2)
+        return {"date": busiest.strftime("%Y-%m-%d"), "format": "json"}
+    return {"hours_back": hours}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_worker(port: int, tool: str, arguments: dict, repeat: int, data_dir: str) -> dict:
+    """Runs inside the worker process: set up the server's tools, call one tool repeat times"""
+    import screenpipe_server
+    from screenpipe_client import close_client
+    from screenpipe_registry import ToolRegistry
+    from screenpipe_tools import TOOLS
+
+    server_args = screenpipe_server.parse_args(["--port", str(port), "--data-dir", data_dir, *SERVER_ARGS])
+    context = screenpipe_server.create_context(server_args)
+    registry = ToolRegistry(TOOLS, server_args.tool_groups)
+    call_tool = screenpipe_server.tool_caller(context, registry)
+
+    async def calls():
+        timings, output_bytes, error, base_rss = [], 0, None, peak_rss_mb()
+        try:
+            # Warm the pooled connection and lazily imported code paths before timing
+            await call_tool("search-content", {"limit": 1})
+            registry.handler(tool)
+            base_rss = peak_rss_mb()
+            for _ in range(repeat):
+                started = time.perf_counter()
+                contents = await call_tool(tool, arguments)
+                timings.append(time.perf_counter() - started)
+                text = "".join(content.text for content in contents)
+                output_bytes = len(text.encode())
+                if text.startswith("failed to") or text.startswith("Error"):
+                    error = text.splitlines()[0][:200]
+        finally:
+            await close_client()
+        return timings, output_bytes, error, base_rss
+
+    timings, output_bytes, error, base_rss = asyncio.run(calls())
+    context.log_writer.close()
+    return {
+        "wall_s": round(statistics.median(timings), 4),
+        "wall_s_min": round(min(timings), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - base_rss, 1),
+        "output_bytes": output_bytes,
+        "error": error,
+    }
+
+
+def measure(port: int, tool: str, arguments: dict, repeat: int, timeout: float) -> dict:
+    """Run one tool in a fresh worker process and return its measurements"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        command = [
+            sys.executable, str(Path(__file__).resolve()), "--worker",
+            "--port", str(port), "--tool", tool, "--arguments", json.dumps(arguments),
+            "--repeat", str(repeat), "--data-dir", data_dir,
+        ]
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {"error": f"timed out after {timeout:g}s"}
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        detail = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+        return {"error": f"worker exited with {completed.returncode}: {detail[:200]}"}
+    return json.loads(lines[-1])
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Lines describing each tool/size against the baseline; regressions are marked"""
+    lines = []
+    old_results = baseline.get("results", {})
+    for tool, sizes in results.items():
+        for size, current in sizes.items():
+            previous = old_results.get(tool, {}).get(size)
+            if not previous or current.get("error") or previous.get("error") or "wall_s" not in previous:
+                continue
+            changes = []
+            regressed = False
+            for key in ("wall_s", "peak_rss_mb"):
+                if previous.get(key):
+                    change = current[key] / previous[key] - 1
+                    regressed |= change > threshold and current[key] - previous[key] > MIN_CHANGE[key]
+                    changes.append(f"{key} {previous[key]} -> {current[key]} ({change:+.0%})")
+            marker = "REGRESSION" if regressed else "ok"
+            lines.append(f"{marker:<11}{tool:<24}{size:>9}  " + ", ".join(changes))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every Screenpipe MCP tool against a fake Screenpipe API')
+    parser.add_argument('--sizes', type=str, default=DEFAULT_SIZES, help=f'Frames in the fake history, comma separated (default: {DEFAULT_SIZES})')
+    parser.add_argument('--tools', type=str, default=DEFAULT_TOOLS, help='Tools to run, comma separated (default: the four analytics/search tools)')
+    parser.add_argument('--hours', type=float, default=24, help='Hours of synthetic history (default: 24)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic history (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Calls per tool; the median is reported (default: 3)')
+    parser.add_argument('--timeout', type=float, default=900, help='Seconds before a worker is abandoned (default: 900)')
+    parser.add_argument('--output', type=str, default="tool_benchmark.json", help='Where to write the results (default: tool_benchmark.json)')
+    parser.add_argument('--baseline', type=str, help='Earlier results to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Relative slowdown counted as a regression (default: {DEFAULT_THRESHOLD:g})')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--tool', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--arguments', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.port, args.tool, json.loads(args.arguments), args.repeat, args.data_dir)))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    tools = [tool.strip() for tool in args.tools.split(",") if tool.strip()]
+    results = {tool: {} for tool in tools}
+
+    print(f"{'tool':<24}{'frames':>9}{'wall s':>10}{'peak RSS MB':>13}{'output B':>11}")
+    for size in sizes:
+        now = datetime.now(timezone.utc)
+        with FakeScreenpipe(SyntheticFrames(size, hours=args.hours, seed=args.seed, end=now)) as fake:
+            for tool in tools:
+                stats = measure(fake.port, tool, tool_arguments(tool, args.hours, now), args.repeat, args.timeout)
+                results[tool][str(size)] = stats
+                if "wall_s" in stats:
+                    print(f"{tool:<24}{size:>9}{stats['wall_s']:>10}{stats['peak_rss_mb']:>13}{stats['output_bytes']:>11}"
+                          + (f"  ({stats['error']})" if stats["error"] else ""))
+                else:
+                    print(f"{tool:<24}{size:>9}  {stats['error']}")
+
+    report = {
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"sizes": sizes, "hours": args.hours, "seed": args.seed, "repeat": args.repeat, "server_args": SERVER_ARGS},
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        lines = compare(results, json.loads(Path(args.baseline).read_text()), args.threshold)
+        print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+        print("\n".join(lines) if lines else "no comparable results")
+        if any(line.startswith("REGRESSION") for line in lines):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
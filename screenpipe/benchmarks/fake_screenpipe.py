@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Screenpipe API, for benchmarking and load-testing the MCP servers offline
+Serves /search, /health and /experimental/operator/pixel over a seeded synthetic history of OCR,
+audio and UI frames. Frames are generated as NumPy columns and only the requested page is turned
+into JSON, so a million-frame history answers in milliseconds. Latency and failures can be injected.
+
+    python fake_screenpipe.py --port 3030 --frames 100000 --hours 24
+    python ../mcp/screenpipe_server.py --port 3030
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp"))
+
+from screenpipe_timestamps import iso_strings, parse_timestamps  # noqa: E402
+
+# Content types in the order of their codes, as /search names them
+TYPES = ["OCR", "Audio", "UI"]
+OCR, AUDIO, UI = range(len(TYPES))
+DEFAULT_MIX = "ocr:0.6,audio:0.2,ui:0.2"
+
+APPS = ["Code", "Terminal", "Chrome", "Slack", "iTerm", "Linear", "Notion", "Xcode", "PyCharm", "Safari"]
+PROJECTS = ["strategy_agents", "screenpipe", "billing-api", "website", "notes"]
+AUDIO_DEVICE = "MacBook Pro Microphone (input)"
+
+VOCABULARY = (
+    PROJECTS + ["python", "rust", "typescript", "swift", "go", "sql"] + """
+    def class return import async await function const let self config request response error
+    test build deploy commit branch merge review issue ticket sprint roadmap meeting agenda notes
+    customer revenue pricing churn pipeline metrics dashboard latency cache index query search
+    frame window session server client token budget design draft summary strategy market launch
+    the and for with from into this that will should could update fix add remove refactor docs
+    """.split()
+)
+
+# Words per run of frames (repeated captures of the same screen) and extra words per frame
+RUN_WORDS = 12
+FRAME_WORDS = 3
+MEAN_RUN_FRAMES = 40
+
+
+def parse_mix(value: str) -> np.ndarray:
+    """"ocr:0.6,audio:0.2,ui:0.2" -> normalized probabilities in TYPES order"""
+    weights = np.zeros(len(TYPES))
+    for part in value.split(","):
+        name, _, weight = part.partition(":")
+        names = [t.lower() for t in TYPES]
+        if name.strip().lower() not in names:
+            raise ValueError(f"unknown content type in mix: {name!r}")
+        weights[names.index(name.strip().lower())] = float(weight or 1)
+    if weights.sum() <= 0:
+        raise ValueError("content mix must have a positive weight")
+    return weights / weights.sum()
+
+
+class SyntheticFrames:
+    """
+    A reproducible frame history ending at `end`, stored as columns.
+
+    Frames come in runs (the same app and window captured repeatedly, like a user working in one
+    place); each run has a base set of words and every frame adds a few of its own, so searches,
+    near-duplicate collapsing and session detection all have realistic material.
+    """
+
+    def __init__(self, count: int, hours: float = 24, seed: int = 0, mix: str = DEFAULT_MIX, end: datetime | None = None):
+        rng = np.random.default_rng(seed)
+        end = end or datetime.now(timezone.utc)
+        self.count = count
+        self.seed = seed
+        self.end = np.datetime64(end.astimezone(timezone.utc).replace(tzinfo=None), "ns")
+        span_ns = int(hours * 3600 * 1e9)
+
+        # Ascending timestamps; row i is the i-th oldest frame
+        self.timestamps = self.end - np.sort(rng.integers(0, span_ns, count))[::-1].astype("timedelta64[ns]")
+        self.types = rng.choice(len(TYPES), size=count, p=parse_mix(mix)).astype(np.int8)
+
+        run_lengths = rng.geometric(1 / MEAN_RUN_FRAMES, size=max(count // MEAN_RUN_FRAMES * 2, 1))
+        run_starts = np.cumsum(run_lengths) - run_lengths
+        self.runs = (np.searchsorted(run_starts, np.arange(count), side="right") - 1).astype(np.int32)
+        run_count = int(self.runs.max()) + 1 if count else 0
+        self.run_apps = rng.integers(0, len(APPS), run_count).astype(np.int8)
+        self.run_projects = rng.integers(0, len(PROJECTS), run_count).astype(np.int8)
+        self.run_words = rng.integers(0, len(VOCABULARY), (run_count, RUN_WORDS)).astype(np.int16)
+        self.frame_words = rng.integers(0, len(VOCABULARY), (count, FRAME_WORDS)).astype(np.int16)
+
+        self.window_names = [f"{project} — {app}" for app in APPS for project in PROJECTS]
+        self.word_lengths = np.array([len(word) for word in VOCABULARY])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def apps(self, rows: np.ndarray) -> np.ndarray:
+        return self.run_apps[self.runs[rows]]
+
+    def windows(self, rows: np.ndarray) -> np.ndarray:
+        runs = self.runs[rows]
+        return self.run_apps[runs].astype(np.int32) * len(PROJECTS) + self.run_projects[runs]
+
+    def text(self, row: int) -> str:
+        words = [VOCABULARY[w] for w in self.run_words[self.runs[row]]]
+        words += [VOCABULARY[w] for w in self.frame_words[row]]
+        if self.types[row] == AUDIO:
+            return " ".join(words)
+        return self.window_names[int(self.windows(np.array([row]))[0])] + "\n" + " ".join(words)
+
+    def text_lengths(self, rows: np.ndarray) -> np.ndarray:
+        lengths = self.word_lengths[self.run_words[self.runs[rows]]].sum(axis=1)
+        lengths += self.word_lengths[self.frame_words[rows]].sum(axis=1) + RUN_WORDS + FRAME_WORDS - 1
+        window_lengths = np.array([len(name) + 1 for name in self.window_names])
+        return np.where(self.types[rows] == AUDIO, lengths, lengths + window_lengths[self.windows(rows)])
+
+    def text_matches(self, rows: np.ndarray, query: str) -> np.ndarray:
+        """Rows whose text contains every word of query (case-insensitive substring match per word)"""
+        mask = np.ones(len(rows), dtype=bool)
+        runs = self.runs[rows]
+        frame_words = self.frame_words[rows]
+        windows = self.windows(rows)
+        for token in query.lower().split():
+            word_ids = [i for i, word in enumerate(VOCABULARY) if token in word]
+            window_ids = [i for i, name in enumerate(self.window_names) if token in name.lower()]
+            # Run words are tested once per run rather than once per frame
+            run_hit = np.isin(self.run_words, word_ids).any(axis=1)
+            hit = run_hit[runs] | np.isin(frame_words, word_ids).any(axis=1)
+            hit |= (self.types[rows] != AUDIO) & np.isin(windows, window_ids)
+            mask &= hit
+        return mask
+
+    def search(self, params: dict) -> tuple[np.ndarray, int]:
+        """Row numbers of one page of matches, newest first, and the total number of matches"""
+        low, high = 0, self.count
+        for key, side in (("start_time", "left"), ("end_time", "right")):
+            if params.get(key):
+                bound, unparsed = parse_timestamps([params[key]])
+                if unparsed:
+                    raise ValueError(f"invalid {key}: {params[key]}")
+                position = int(np.searchsorted(self.timestamps, bound[0], side=side))
+                low, high = (position, high) if key == "start_time" else (low, position)
+        rows = np.arange(low, max(low, high))
+
+        content_type = (params.get("content_type") or "all").lower()
+        if content_type != "all":
+            wanted = [code for code, name in enumerate(TYPES) if name.lower() in content_type.split("+")]
+            rows = rows[np.isin(self.types[rows], wanted)]
+        if params.get("app_name"):
+            app = params["app_name"]
+            codes = [code for code, name in enumerate(APPS) if name.lower() == app.lower()]
+            rows = rows[(self.types[rows] != AUDIO) & np.isin(self.apps(rows), codes)]
+        if params.get("window_name"):
+            needle = params["window_name"].lower()
+            codes = [code for code, name in enumerate(self.window_names) if needle in name.lower()]
+            rows = rows[(self.types[rows] != AUDIO) & np.isin(self.windows(rows), codes)]
+        if params.get("q"):
+            rows = rows[self.text_matches(rows, params["q"])]
+        if params.get("min_length") or params.get("max_length"):
+            lengths = self.text_lengths(rows)
+            keep = np.ones(len(rows), dtype=bool)
+            if params.get("min_length"):
+                keep &= lengths >= int(params["min_length"])
+            if params.get("max_length"):
+                keep &= lengths <= int(params["max_length"])
+            rows = rows[keep]
+
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 20)
+        newest_first = rows[::-1]
+        return newest_first[offset:offset + limit], len(rows)
+
+    def results(self, rows: np.ndarray) -> list[dict]:
+        """Rows in the shape /search returns them"""
+        timestamps = iso_strings(self.timestamps[rows])
+        apps = self.apps(rows)
+        windows = self.windows(rows)
+        results = []
+        for i, row in enumerate(rows.tolist()):
+            kind = int(self.types[row])
+            text = self.text(row)
+            if kind == AUDIO:
+                content = {
+                    "chunk_id": row + 1,
+                    "transcription": text,
+                    "timestamp": timestamps[i],
+                    "file_path": f"audio/{AUDIO_DEVICE}_{timestamps[i][:10]}.mp4",
+                    "offset_index": row % 30,
+                    "tags": [],
+                    "device_name": AUDIO_DEVICE,
+                    "device_type": "Input",
+                    "speaker": None,
+                }
+            else:
+                content = {
+                    "frame_id" if kind == OCR else "id": row + 1,
+                    "text": text,
+                    "timestamp": timestamps[i],
+                    "file_path": f"monitor_1_{timestamps[i][:10]}.mp4",
+                    "offset_index": row % 30,
+                    "app_name": APPS[int(apps[i])],
+                    "window_name": self.window_names[int(windows[i])],
+                    "tags": [],
+                    "browser_url": None,
+                }
+            results.append({"type": TYPES[kind], "content": content})
+        return results
+
+    def latest(self, kind: int | None = None) -> str | None:
+        rows = np.flatnonzero(self.types == kind) if kind is not None else np.arange(self.count)
+        return iso_strings(self.timestamps[rows[-1:]])[0] if len(rows) else None
+
+
+class FakeScreenpipe:
+    """
+    The fake API on a background thread.
+
+    latency_ms (plus up to jitter_ms) is added to every response; error_rate of requests fail
+    with error_status. Counters per path are kept in `requests`.
+    """
+
+    def __init__(
+        self,
+        frames: SyntheticFrames,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+    ):
+        self.frames = frames
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests: dict[str, dict] = {}
+        self._random = random.Random(frames.seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.httpd.server_address[0]}:{self.port}"
+
+    def start(self) -> "FakeScreenpipe":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeScreenpipe":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def _inject(self) -> tuple[float, bool]:
+        """Delay in seconds for the next response and whether it should fail"""
+        with self._lock:
+            delay = self.latency_ms + (self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay / 1000, fail
+
+    def _count(self, path: str, status: int, size: int):
+        with self._lock:
+            counters = self.requests.setdefault(path, {"requests": 0, "errors": 0, "bytes": 0})
+            counters["requests"] += 1
+            counters["errors"] += status >= 400
+            counters["bytes"] += size
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def reply(self, status: int, payload: dict):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on this request (timeout or shutdown)
+                    pass
+                fake._count(urlparse(self.path).path, status, len(body))
+
+            def handle_injected(self) -> bool:
+                delay, fail = fake._inject()
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    self.reply(fake.error_status, {"error": "injected failure"})
+                return fail
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path not in ("/search", "/health"):
+                    self.reply(404, {"error": f"not found: {url.path}"})
+                    return
+                if self.handle_injected():
+                    return
+                if url.path == "/health":
+                    self.reply(200, {
+                        "status": "healthy",
+                        "status_code": 200,
+                        "last_frame_timestamp": fake.frames.latest(OCR),
+                        "last_audio_timestamp": fake.frames.latest(AUDIO),
+                        "last_ui_timestamp": fake.frames.latest(UI),
+                        "frame_status": "ok",
+                        "audio_status": "ok",
+                        "ui_status": "ok",
+                        "message": "all systems are functioning normally.",
+                    })
+                    return
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                try:
+                    rows, total = fake.frames.search(params)
+                except ValueError as e:
+                    self.reply(400, {"error": str(e)})
+                    return
+                limit = int(params.get("limit") or 20)
+                offset = int(params.get("offset") or 0)
+                self.reply(200, {
+                    "data": fake.frames.results(rows),
+                    "pagination": {"limit": limit, "offset": offset, "total": total},
+                })
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if url.path != "/experimental/operator/pixel":
+                    self.reply(404, {"error": f"not found: {url.path}"})
+                    return
+                if self.handle_injected():
+                    return
+                try:
+                    action = json.loads(body or b"{}").get("action") or {}
+                except (ValueError, AttributeError):
+                    action = {}
+                if not action.get("type"):
+                    self.reply(400, {"success": False, "error": "missing action type"})
+                    return
+                self.reply(200, {"success": True, "action": action.get("type")})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def add_fake_arguments(parser: argparse.ArgumentParser):
+    """Options describing the synthetic history and injected faults (shared with the benchmarks)"""
+    parser.add_argument('--frames', type=int, default=10_000, help='Frames in the synthetic history (default: 10000)')
+    parser.add_argument('--hours', type=float, default=24, help='Hours of history, ending now (default: 24)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for frames and injected faults (default: 0)')
+    parser.add_argument('--mix', type=str, default=DEFAULT_MIX, help=f'Content type weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added to every response (default: 0)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Random extra latency up to this much (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail (default: 0)')
+    parser.add_argument('--error-status', type=int, default=500, help='HTTP status of injected failures (default: 500)')
+
+
+def fake_from_args(args, host: str = "127.0.0.1", port: int = 0) -> FakeScreenpipe:
+    frames = SyntheticFrames(args.frames, hours=args.hours, seed=args.seed, mix=args.mix)
+    return FakeScreenpipe(
+        frames, host=host, port=port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, error_status=args.error_status,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Screenpipe API serving synthetic frames')
+    parser.add_argument('--port', type=int, default=3030, help='Port to listen on (default: 3030)')
+    parser.add_argument('--host', type=str, default="127.0.0.1", help='Interface to bind (default: 127.0.0.1)')
+    add_fake_arguments(parser)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    fake = fake_from_args(args, host=args.host, port=args.port)
+    print(
+        f"Fake Screenpipe API on {fake.url}: {len(fake.frames)} frames over {args.hours:g} hours "
+        f"(seed {args.seed}, generated in {time.perf_counter() - started:.2f}s)",
+        flush=True,
+    )
+    try:
+        fake.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.httpd.server_close()
+        for path, counters in sorted(fake.requests.items()):
+            print(f"{path}: {counters['requests']} requests, {counters['errors']} errors, {counters['bytes']} bytes")
+
+
+if __name__ == "__main__":
+    main()
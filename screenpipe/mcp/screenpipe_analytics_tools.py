@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Analytics tools of the Screenpipe MCP server
+analyze-productivity, find-coding-sessions and export-daily-summary, over columnar frame
+batches and the hourly rollup store. The heaviest group (NumPy, SQLite rollups), so it is
+only imported once one of these tools is called or rollups are enabled.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import mcp.types as types
+import numpy as np
+
+from screenpipe_coalesce import request_key
+from screenpipe_defaults import DEFAULT_IDLE_CAP_SECONDS
+from screenpipe_frames import FrameBatchBuilder, rollup_rows
+from screenpipe_index import format_utc, frame_key, to_utc
+from screenpipe_rollup import ROLLUP_FILENAME, RollupStore
+from screenpipe_rollup import merge as merge_rollup
+from screenpipe_search_tools import iter_frame_pages, scan_each_app
+from screenpipe_sessions import DEFAULT_IDLE_GAP_MINUTES, format_duration, sessionize_batch
+
+async def activity_rollup(context, name, start_time, end_time, content_type=None, idle_cap_seconds=DEFAULT_IDLE_CAP_SECONDS):
+    """
+    Frame counts and screen time keyed by (hour, app, content type) over [start_time, end_time]:
+    stored rollups for closed hours, plus a live scan of whatever they do not cover (always
+    including the open hour). Stored rows are only used when their idle cap matches.
+
+    With idle_cap_seconds=None only frame counts are wanted (seconds are left at 0 for live
+    rows): any stored rows will do, and live pages are folded in one at a time so memory stays
+    flat. Screen time orders every OCR frame of the live range, so that scan holds them all.
+    """
+    start, end = to_utc(start_time), to_utc(end_time)
+    rows = {}
+    stats = {"rollup_hours": 0, "frames_scanned": 0, "pages_scanned": 0, "unparsed": 0}
+
+    def fold(builder, range_end):
+        batch_rows, skipped = rollup_rows(builder.build(), idle_cap_seconds, range_end)
+        stats["unparsed"] += skipped
+        merge_rollup(rows, batch_rows)
+
+    rollup_store = context.rollup_store
+    live_ranges = [(start, end)]
+    covered = None
+    if rollup_store and idle_cap_seconds in (None, rollup_store.idle_cap_seconds):
+        covered = rollup_store.covered_range(start, end)
+    if covered:
+        covered_start, covered_end = covered
+        for key, row in (await rollup_store.rows(covered_start, covered_end)).items():
+            if content_type is None or key[2] == content_type:
+                rows[key] = row
+        stats["rollup_hours"] = int((covered_end - covered_start) / timedelta(hours=1))
+        live_ranges = [(start, covered_start - timedelta(microseconds=1)), (covered_end, end)]
+
+    for live_start, live_end in live_ranges:
+        if live_start > live_end:
+            continue
+        params = {"start_time": format_utc(live_start), "end_time": format_utc(live_end)}
+        if content_type:
+            params["content_type"] = content_type
+        builder = FrameBatchBuilder(keep_text=False)
+        async for page in iter_frame_pages(context, name, params):
+            stats["pages_scanned"] += 1
+            stats["frames_scanned"] += len(page)
+            builder.add_page(page)
+            if idle_cap_seconds is None:
+                fold(builder, None)
+                builder = FrameBatchBuilder(keep_text=False)
+        fold(builder, format_utc(live_end)[:-1])
+
+    return rows, stats
+
+async def rollup_forever(context):
+    """Open the rollup store and roll up each newly closed hour in the background"""
+    rollup_store = context.rollup_store = RollupStore(
+        context.data_path / ROLLUP_FILENAME,
+        backfill_hours=context.args.rollup_backfill_hours
+    )
+    while True:
+        try:
+            skipped = rollup_store.skipped_frames
+            added = await rollup_store.advance(lambda params: iter_frame_pages(context, "index-sync", params))
+            if added:
+                context.log(f"Rolled up {added} hours of activity")
+            if rollup_store.skipped_frames > skipped:
+                context.log(f"Rollup skipped {rollup_store.skipped_frames - skipped} frames with unparseable timestamps")
+        except Exception as e:
+            context.log(f"Rollup error: {str(e)}")
+        await asyncio.sleep(context.args.rollup_interval)
+
+async def analyze_productivity(context, name, arguments):
+    try:
+        hours_back = arguments.get("hours_back", 8)
+        focus_apps = arguments.get("focus_apps", ["VSCode", "Code", "Terminal", "Linear", "Notion"])
+        idle_cap_seconds = arguments.get("idle_cap_seconds", DEFAULT_IDLE_CAP_SECONDS)
+
+        async def productivity_rollup():
+            # Calculate time range
+            end_time = datetime.now()
+            start_time = end_time - timedelta(hours=hours_back)
+
+            # OCR activity per hour and app for the period (pre-aggregated hours + live open hour)
+            return await activity_rollup(
+                context,
+                name,
+                start_time.isoformat() + "Z",
+                end_time.isoformat() + "Z",
+                content_type="ocr",
+                idle_cap_seconds=idle_cap_seconds
+            )
+
+        # focus_apps only changes the report, so calls differing in it still share the scan
+        rows, stats = await context.inflight.do(
+            request_key(name, {"hours_back": hours_back, "idle_cap_seconds": idle_cap_seconds}),
+            productivity_rollup
+        )
+
+        # Analyze productivity patterns: time-weighted seconds on screen per app
+        app_usage = {}
+        app_frames = {}
+        focus_time = 0
+        total_time = 0
+        total_frames = 0
+
+        for (hour, app_name, content_type), (frames, first_seen, last_seen, seconds) in rows.items():
+            if app_name not in app_usage:
+                app_usage[app_name] = 0
+                app_frames[app_name] = 0
+            app_usage[app_name] += seconds
+            app_frames[app_name] += frames
+
+            if app_name in focus_apps:
+                focus_time += seconds
+            total_time += seconds
+            total_frames += frames
+
+        # Calculate focus percentage
+        focus_percentage = (focus_time / total_time * 100) if total_time > 0 else 0
+
+        # Sort apps by time on screen
+        sorted_apps = sorted(app_usage.items(), key=lambda x: x[1], reverse=True)
+
+        # Generate insights
+        insights = f"""Productivity Analysis ({hours_back} hours):
+
+Screen Time: {format_duration(timedelta(seconds=total_time))} (gaps over {idle_cap_seconds:g}s counted as idle)
+Focus Time: {focus_percentage:.1f}% ({format_duration(timedelta(seconds=focus_time))} focus, {format_duration(timedelta(seconds=total_time - focus_time))} other)
+
+Top Applications:
+"""
+        for app, seconds in sorted_apps[:10]:
+            percentage = (seconds / total_time * 100) if total_time > 0 else 0
+            focus_indicator = "🎯" if app in focus_apps else "📱"
+            insights += f"{focus_indicator} {app}: {format_duration(timedelta(seconds=seconds))} ({percentage:.1f}%, {app_frames[app]} frames)\n"
+
+        insights += f"\nData points analyzed: {total_frames}"
+        insights += f" ({stats['rollup_hours']} hours from rollups, {stats['frames_scanned']} frames scanned live)"
+        if stats["unparsed"]:
+            insights += f"\n\n⚠️ Skipped {stats['unparsed']} frames with unparseable timestamps"
+
+        return [types.TextContent(
+            type="text",
+            text=insights
+        )]
+
+    except Exception as e:
+        context.log(f"Productivity analysis error: {str(e)}")
+        return [types.TextContent(
+            type="text",
+            text=f"failed to analyze productivity: {str(e)}"
+        )]
+
+async def find_coding_sessions(context, name, arguments):
+    try:
+        hours_back = arguments.get("hours_back", 24)
+        language = arguments.get("language")
+        project = arguments.get("project")
+        idle_gap = timedelta(minutes=arguments.get("idle_gap_minutes", DEFAULT_IDLE_GAP_MINUTES))
+
+        # Calculate time range
+        end_time = datetime.now()
+        start_time = end_time - timedelta(hours=hours_back)
+
+        # Search for coding-related content over the whole window
+        search_params = {
+            "start_time": start_time.isoformat() + "Z",
+            "end_time": end_time.isoformat() + "Z",
+        }
+
+        # Add app filter for coding apps
+        coding_apps = ["VSCode", "Code", "Terminal", "iTerm", "Xcode", "IntelliJ", "PyCharm"]
+
+        # Stream every app's whole window concurrently into one columnar batch. A frame can
+        # answer more than one app's query, so each is added once, under its own app;
+        # failures are reported per app below
+        builder = FrameBatchBuilder()
+        seen = set()
+
+        def add_page(app, page):
+            fresh = []
+            for result in page:
+                key = frame_key(result)
+                if key not in seen:
+                    seen.add(key)
+                    fresh.append(result)
+            builder.add_page(fresh)
+
+        failed_apps = await scan_each_app(context, name, coding_apps, search_params, add_page)
+        frames = builder.build()
+
+        keep = np.ones(len(frames), dtype=bool)
+
+        # Filter by language if specified
+        if language:
+            keep &= frames.text_contains(language)
+
+        # Filter by project if specified (window titles usually carry it)
+        if project:
+            keep &= frames.text_contains(project) | frames.window_contains(project)
+
+        valid = frames.valid()
+        unparsed = int((keep & ~valid).sum())
+        frames = frames.take(keep & valid).sorted()
+
+        # One vectorized pass oldest first to build sessions, listed newest first
+        sessions = sessionize_batch(frames, idle_gap)
+        sessions.reverse()
+
+        failure_note = ""
+        if failed_apps:
+            failure_note = "\n\n⚠️ Search failed for (sessions may be incomplete): " + ", ".join(
+                f"{app} ({error})" for app, error in failed_apps.items()
+            )
+        if unparsed:
+            failure_note += f"\n\n⚠️ Skipped {unparsed} frames with unparseable timestamps"
+
+        if not sessions:
+            return [types.TextContent(
+                type="text",
+                text=f"No coding sessions found in the last {hours_back} hours{failure_note}"
+            )]
+
+        # Generate summary
+        total_time = sum((session.duration for session in sessions), timedelta())
+        summary = (
+            f"Found {len(sessions)} coding sessions in the last {hours_back} hours "
+            f"({format_duration(total_time)} total, {len(frames)} frames, "
+            f"idle gap {int(idle_gap.total_seconds() // 60)}m):\n\n"
+        )
+
+        for i, session in enumerate(sessions[:20], 1):
+            summary += (
+                f"{i}. {session.start.strftime('%m/%d %H:%M')} → {session.end.strftime('%H:%M')} "
+                f"({format_duration(session.duration)}) - {session.dominant_app}\n"
+            )
+            if session.project:
+                summary += f"   Project: {session.project}\n"
+            summary += f"   Windows: {' | '.join(session.top_windows()) or 'N/A'}\n"
+            summary += f"   Frames: {session.frames}\n\n"
+
+        if len(sessions) > 20:
+            summary += f"... and {len(sessions) - 20} more sessions"
+
+        summary += failure_note
+
+        return [types.TextContent(
+            type="text",
+            text=summary
+        )]
+
+    except Exception as e:
+        context.log(f"Coding sessions error: {str(e)}")
+        return [types.TextContent(
+            type="text",
+            text=f"failed to find coding sessions: {str(e)}"
+        )]
+
+async def export_daily_summary(context, name, arguments):
+    try:
+        date_str = arguments.get("date", datetime.now().strftime("%Y-%m-%d"))
+        format_type = arguments.get("format", "json")
+
+        # Parse date
+        target_date = datetime.strptime(date_str, "%Y-%m-%d")
+        start_time = target_date.replace(hour=0, minute=0, second=0)
+        end_time = target_date.replace(hour=23, minute=59, second=59)
+
+        # Frame counts only, so activity_rollup folds each page in as it arrives and memory stays
+        # flat however busy the day was
+        summary_data = {
+            "date": date_str,
+            "total_activities": 0,
+            "frames_scanned": 0,
+            "pages_scanned": 0,
+            "rollup_hours": 0,
+            "unparsed_timestamps": 0,
+            "apps": {},
+            "hourly_activity": {},
+            "content_types": {"ocr": 0, "audio": 0, "ui": 0}
+        }
+
+        # Closed hours come from the rollup store; the rest is walked page by page
+        rows, stats = await activity_rollup(
+            context,
+            name,
+            start_time.isoformat() + "Z",
+            end_time.isoformat() + "Z",
+            idle_cap_seconds=None
+        )
+        summary_data["frames_scanned"] = stats["frames_scanned"]
+        summary_data["pages_scanned"] = stats["pages_scanned"]
+        summary_data["rollup_hours"] = stats["rollup_hours"]
+        summary_data["unparsed_timestamps"] = stats["unparsed"]
+
+        for (hour, app_name, content_type), (frames, first_seen, last_seen, seconds) in rows.items():
+            summary_data["total_activities"] += frames
+
+            # Count apps
+            if app_name not in summary_data["apps"]:
+                summary_data["apps"][app_name] = 0
+            summary_data["apps"][app_name] += frames
+
+            # Count content types
+            if content_type in summary_data["content_types"]:
+                summary_data["content_types"][content_type] += frames
+
+            # Count hourly activity
+            hour_of_day = to_utc(hour).hour
+            if hour_of_day not in summary_data["hourly_activity"]:
+                summary_data["hourly_activity"][hour_of_day] = 0
+            summary_data["hourly_activity"][hour_of_day] += frames
+
+        # Save to file
+        filename = f"daily_summary_{date_str}.{format_type}"
+        filepath = context.data_path / filename
+
+        if format_type == "json":
+            with open(filepath, "w") as f:
+                json.dump(summary_data, f, indent=2)
+        elif format_type == "markdown":
+            with open(filepath, "w") as f:
+                f.write(f"# Daily Summary - {date_str}\n\n")
+                f.write(f"**Total Activities:** {summary_data['total_activities']}\n\n")
+                f.write("## Top Applications\n")
+                for app, count in sorted(summary_data['apps'].items(), key=lambda x: x[1], reverse=True)[:10]:
+                    f.write(f"- {app}: {count}\n")
+                f.write("\n## Hourly Activity\n")
+                for hour in sorted(summary_data['hourly_activity'].keys()):
+                    f.write(f"- {hour:02d}:00: {summary_data['hourly_activity'][hour]}\n")
+
+        context.log(f"Exported daily summary to {filepath}")
+
+        return [types.TextContent(
+            type="text",
+            text=f"Daily summary exported to {filepath}\n\nSummary:\n- Total activities: {summary_data['total_activities']}\n- Frames scanned: {summary_data['frames_scanned']} ({summary_data['pages_scanned']} pages, {summary_data['rollup_hours']} hours from rollups)\n- Apps used: {len(summary_data['apps'])}\n- Most active hour: {max(summary_data['hourly_activity'], key=summary_data['hourly_activity'].get) if summary_data['hourly_activity'] else 'N/A'}"
+            + (f"\n- Skipped {summary_data['unparsed_timestamps']} frames with unparseable timestamps" if summary_data["unparsed_timestamps"] else "")
+        )]
+
+    except Exception as e:
+        context.log(f"Export error: {str(e)}")
+        return [types.TextContent(
+            type="text",
+            text=f"failed to export daily summary: {str(e)}"
+        )]
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+In-process TTL + LRU cache for Screenpipe search results
+Windows that ended in the past do not change, so their results are kept long-term;
+windows touching "now" are only reused for a few seconds. Bounded by an approximate byte budget.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from screenpipe_index import to_utc
+
+DEFAULT_CACHE_MAX_MB = 64
+DEFAULT_LIVE_TTL = 10.0
+DEFAULT_SETTLED_TTL = 24 * 3600.0
+
+# A window counts as settled once its end is this far in the past, so late OCR writes have landed
+SETTLE_GRACE = timedelta(minutes=2)
+
+
+def result_size(value) -> int:
+    """Approximate in-memory cost of a cached value: the length of its JSON encoding"""
+    return len(json.dumps(value, default=str))
+
+
+class ResultCache:
+    """LRU cache with per-entry expiry and a byte budget"""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+        live_ttl: float = DEFAULT_LIVE_TTL,
+        settled_ttl: float = DEFAULT_SETTLED_TTL,
+    ):
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self.settled_ttl = settled_ttl
+        self._entries: OrderedDict[str, tuple[float, int, object]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def ttl_for(self, end_time, now: datetime | None = None) -> float:
+        """Long TTL when the window ended in the past, short TTL when it is open or runs up to now"""
+        try:
+            end = to_utc(end_time)
+        except ValueError:
+            end = None
+        now = now or datetime.now(timezone.utc)
+        if end is not None and end + SETTLE_GRACE < now:
+            return self.settled_ttl
+        return self.live_ttl
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, size, value = entry
+        if expires < time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value, ttl: float):
+        if ttl <= 0:
+            return
+        size = result_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Bounded capture of terminal command output
+Keeps the first and last half of a byte budget of a stream in memory. Once a stream outgrows
+the budget, everything it wrote is also streamed to a spill file under logs/, so the full
+output stays retrievable without being held in RAM or returned to the model.
+"""
+
+import asyncio
+import time
+import uuid
+from pathlib import Path
+
+# Bytes read from a pipe at a time
+READ_CHUNK = 64 * 1024
+
+# Spill files kept per directory before the oldest are deleted
+MAX_SPILL_FILES = 50
+
+
+def spill_file(directory: Path, label: str) -> Path:
+    """A new spill file path in directory, pruning the oldest spill files beyond MAX_SPILL_FILES"""
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = sorted(directory.glob("*.log"))
+    for old in existing[:max(len(existing) - MAX_SPILL_FILES + 1, 0)]:
+        old.unlink(missing_ok=True)
+    return directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}-{label}.log"
+
+
+class OutputCapture:
+    """The head and tail of one output stream within budget bytes (None: keep everything)"""
+
+    def __init__(self, budget: int | None = None, spill_dir: Path | None = None, label: str = "output"):
+        self.budget = budget or None
+        self.spill_dir = spill_dir
+        self.label = label
+        self.total = 0
+        self.spill_path = None
+        self._spill = None
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    @property
+    def truncated(self) -> bool:
+        return self.budget is not None and self.total > self.budget
+
+    @property
+    def _tail_budget(self) -> int:
+        return self.budget - self.budget // 2
+
+    def write(self, chunk: bytes):
+        if not chunk:
+            return
+        self.total += len(chunk)
+        if self.budget is None:
+            self._head += chunk
+            return
+
+        if self._spill:
+            try:
+                self._spill.write(chunk)
+            except OSError:
+                self._drop_spill()
+        elif self.truncated and self.spill_dir and self.spill_path is None:
+            # Until now head + tail held every byte, so the spill file starts complete
+            self._open_spill(bytes(self._head) + bytes(self._tail) + chunk)
+
+        room = self.budget // 2 - len(self._head)
+        if room > 0:
+            self._head += chunk[:room]
+            rest = chunk[room:]
+        else:
+            rest = chunk
+        self._tail += rest
+        if len(self._tail) > 2 * self._tail_budget:
+            # Trimmed in bulk so each byte is moved at most twice
+            del self._tail[:-self._tail_budget]
+
+    def _open_spill(self, data: bytes):
+        try:
+            self.spill_path = spill_file(self.spill_dir, self.label)
+            self._spill = open(self.spill_path, "wb")
+            self._spill.write(data)
+        except OSError:
+            self._drop_spill()
+
+    def _drop_spill(self):
+        """Output is still truncated in memory, just not saved in full"""
+        self.close()
+        if self.spill_path:
+            self.spill_path.unlink(missing_ok=True)
+        self.spill_path = None
+        self.spill_dir = None
+
+    def close(self):
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+    def text(self) -> str:
+        """The captured output; when truncated, head and tail around a note of what was left out"""
+        if not self.truncated:
+            return (bytes(self._head) + bytes(self._tail)).decode("utf-8", errors="replace")
+        tail = bytes(self._tail[-self._tail_budget:])
+        omitted = self.total - len(self._head) - len(tail)
+        saved = f"full output saved to {self.spill_path}" if self.spill_path else "full output not saved"
+        return (
+            f"{bytes(self._head).decode('utf-8', errors='replace')}"
+            f"\n\n[... {omitted} bytes omitted, {self.total} bytes in total; {saved} ...]\n\n"
+            f"{tail.decode('utf-8', errors='replace')}"
+        )
+
+
+async def capture_stream(stream: asyncio.StreamReader, capture: OutputCapture):
+    """Copy stream into capture until EOF"""
+    while True:
+        chunk = await stream.read(READ_CHUNK)
+        if not chunk:
+            return
+        capture.write(chunk)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the Screenpipe MCP servers
+One pooled httpx.AsyncClient per process so every tool call reuses keep-alive connections
+"""
+
+from contextlib import asynccontextmanager
+
+import httpx
+
+# Connection pool defaults (override from the server command line)
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# Per-tool request timeouts in seconds (a server's --tool-timeout overrides live on its ToolContext)
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_TOOL_TIMEOUTS = {
+    "search-content": 30.0,
+    "analyze-productivity": 30.0,
+    "find-coding-sessions": 30.0,
+    "export-daily-summary": 30.0,
+    "pixel-control": 10.0,
+    "test-connection": 5.0,
+    "get-health": 10.0,
+    "index-sync": 60.0,
+}
+
+_client: httpx.AsyncClient | None = None
+
+
+def create_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    event_hooks: dict | None = None,
+) -> httpx.AsyncClient:
+    """Create the process-wide pooled client, replacing any previous one"""
+    global _client
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+    )
+    _client = httpx.AsyncClient(limits=limits, timeout=DEFAULT_TIMEOUT, event_hooks=event_hooks)
+    return _client
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating one with default limits if run() has not"""
+    if _client is None or _client.is_closed:
+        return create_client()
+    return _client
+
+
+async def close_client():
+    """Close the shared client and release its pooled connections"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def tool_timeout(name: str, overrides: dict[str, float] | None = None) -> float:
+    """Timeout in seconds for upstream requests made by a tool: its override, else its default"""
+    if overrides and name in overrides:
+        return overrides[name]
+    return DEFAULT_TOOL_TIMEOUTS.get(name, DEFAULT_TIMEOUT)
+
+
+def parse_timeout_overrides(values: list[str] | None) -> dict[str, float]:
+    """Parse repeated --tool-timeout NAME=SECONDS command line values (ValueError when malformed)"""
+    overrides = {}
+    for value in values or []:
+        name, sep, seconds = value.partition("=")
+        try:
+            timeout = float(seconds)
+        except ValueError:
+            timeout = None
+        if not sep or not name.strip() or timeout is None or not timeout > 0:
+            raise ValueError(f"invalid --tool-timeout value '{value}', expected NAME=SECONDS with SECONDS > 0")
+        overrides[name.strip()] = timeout
+    return overrides
+
+
+@asynccontextmanager
+async def pooled_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    event_hooks: dict | None = None,
+):
+    """Own the shared client for the lifetime of a server run"""
+    client = create_client(max_connections, max_keepalive, keepalive_expiry, event_hooks)
+    try:
+        yield client
+    finally:
+        await close_client()
+
+
+def add_client_arguments(parser):
+    """Register the connection pool options on a server's argument parser"""
+    parser.add_argument('--max-connections', type=int, default=DEFAULT_MAX_CONNECTIONS,
+                        help=f'Maximum pooled connections to the screenpipe API (default: {DEFAULT_MAX_CONNECTIONS})')
+    parser.add_argument('--max-keepalive', type=int, default=DEFAULT_MAX_KEEPALIVE,
+                        help=f'Maximum idle keep-alive connections (default: {DEFAULT_MAX_KEEPALIVE})')
+    parser.add_argument('--tool-timeout', action='append', metavar='NAME=SECONDS',
+                        help='Override the upstream timeout for one tool (repeatable)')
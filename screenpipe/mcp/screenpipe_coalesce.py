@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Single-flight coalescing of identical in-flight Screenpipe queries
+Concurrent calls with the same normalized parameters await one shared task, so a burst of
+identical tool calls costs the Screenpipe daemon a single request and a single parse
+"""
+
+import asyncio
+import json
+
+from screenpipe_index import normalize_timestamp
+
+# Parameters that default upstream when omitted; filled in so explicit defaults share a key
+SEARCH_DEFAULTS = {"content_type": "all", "limit": 10, "offset": 0}
+
+TIME_KEYS = ("start_time", "end_time")
+INT_KEYS = ("limit", "offset", "min_length", "max_length")
+
+
+def normalize_params(params: dict, defaults: dict | None = None) -> dict:
+    """Canonical form of query parameters: no empty values, trimmed strings, UTC timestamps, defaults filled"""
+    normalized = dict(defaults or {})
+    for key, value in params.items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        if key in TIME_KEYS:
+            try:
+                value = normalize_timestamp(value)
+            except ValueError:
+                pass
+        elif key in INT_KEYS:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                pass
+        elif key == "content_type":
+            value = value.lower()
+        normalized[key] = value
+    return normalized
+
+
+def request_key(name: str, params: dict, defaults: dict | None = None) -> str:
+    """Stable key for a tool's query parameters"""
+    return name + ":" + json.dumps(normalize_params(params, defaults), sort_keys=True, default=str)
+
+
+class SingleFlight:
+    """Run at most one task per key; callers arriving while it runs share its result or exception"""
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn):
+        """Await fn() for key, or join the call already in flight for it"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self.executed += 1
+        else:
+            self.shared += 1
+        # Shielded so one caller being cancelled does not cancel the work for everyone else
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
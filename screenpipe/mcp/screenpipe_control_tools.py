@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Control tools of the Screenpipe MCP server
+pixel-control through Screenpipe's operator API on every platform; open-application and
+open-url through `open` on macOS, run as asyncio subprocesses.
+"""
+
+import mcp.types as types
+
+from screenpipe_client import get_client
+from screenpipe_process import run_process
+
+# Seconds allowed for `open` to hand off to the application
+OPEN_TIMEOUT = 10
+
+async def pixel_control(context, name, arguments):
+    client = get_client()
+    try:
+        action = {
+            "type": arguments.get("action_type"),
+            "data": arguments.get("data")
+        }
+
+        response = await client.post(
+            f"{context.api}/experimental/operator/pixel",
+            json={"action": action},
+            timeout=context.tool_timeout(name)
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        if not data.get("success", False):
+            return [types.TextContent(
+                type="text",
+                text=f"failed to perform input control: {data.get('error', 'unknown error')}"
+            )]
+
+        action_type = arguments.get("action_type")
+        action_data = arguments.get("data")
+
+        if action_type == "WriteText":
+            result_text = f"successfully typed text: '{action_data}'"
+        elif action_type == "KeyPress":
+            result_text = f"successfully pressed key: '{action_data}'"
+        elif action_type == "MouseMove":
+            result_text = f"successfully moved mouse to coordinates: x={action_data.get('x')}, y={action_data.get('y')}"
+        elif action_type == "MouseClick":
+            result_text = f"successfully clicked {action_data} mouse button"
+        else:
+            result_text = "successfully performed input control action"
+
+        return [types.TextContent(
+            type="text",
+            text=result_text
+        )]
+
+    except Exception as e:
+        return [types.TextContent(
+            type="text",
+            text=f"failed to perform input control: {str(e)}"
+        )]
+
+async def open_application(context, name, arguments):
+    app_name = arguments.get("app_name", "")
+    if not app_name:
+        return [types.TextContent(
+            type="text",
+            text="No application name provided"
+        )]
+
+    try:
+        result = await run_process(['open', '-a', app_name], OPEN_TIMEOUT)
+
+        if result.timed_out:
+            return [types.TextContent(
+                type="text",
+                text=f"failed to open application '{app_name}': timed out after {OPEN_TIMEOUT} seconds"
+            )]
+        elif result.returncode == 0:
+            return [types.TextContent(
+                type="text",
+                text=f"successfully opened application '{app_name}'"
+            )]
+        else:
+            return [types.TextContent(
+                type="text",
+                text=f"failed to open application '{app_name}': {result.stderr}"
+            )]
+    except Exception as e:
+        return [types.TextContent(
+            type="text",
+            text=f"failed to open application: {str(e)}"
+        )]
+
+async def open_url(context, name, arguments):
+    url = arguments.get("url", "")
+    browser = arguments.get("browser")
+
+    if not url:
+        return [types.TextContent(
+            type="text",
+            text="No URL provided"
+        )]
+
+    try:
+        command = ['open', '-a', browser, url] if browser else ['open', url]
+        result = await run_process(command, OPEN_TIMEOUT)
+
+        if result.timed_out:
+            return [types.TextContent(
+                type="text",
+                text=f"failed to open URL: timed out after {OPEN_TIMEOUT} seconds"
+            )]
+        elif result.returncode == 0:
+            return [types.TextContent(
+                type="text",
+                text=f"successfully opened URL: {url}"
+            )]
+        else:
+            return [types.TextContent(
+                type="text",
+                text=f"failed to open URL: {result.stderr}"
+            )]
+    except Exception as e:
+        return [types.TextContent(
+            type="text",
+            text=f"failed to open URL: {str(e)}"
+        )]
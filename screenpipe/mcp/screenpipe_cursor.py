@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Opaque continuation cursors for polling search-content
+A cursor records the newest timestamp returned and the identities of the frames at exactly that
+timestamp, plus a fingerprint of the query it belongs to. Passing it back narrows the query to
+start_time = that timestamp and drops the frames already seen.
+"""
+
+import base64
+import hashlib
+import json
+
+from screenpipe_coalesce import normalize_params
+from screenpipe_index import frame_key, normalize_timestamp
+
+# Parameters that may change between polls without invalidating a cursor
+CURSOR_FREE_PARAMS = {"start_time", "end_time", "limit", "offset", "cursor"}
+
+# Length of the frame identities kept in a cursor
+ID_LENGTH = 12
+
+
+def query_fingerprint(params: dict) -> str:
+    """Short hash of the parameters that define which frames a query matches"""
+    scoped = normalize_params({k: v for k, v in params.items() if k not in CURSOR_FREE_PARAMS})
+    return hashlib.sha1(json.dumps(scoped, sort_keys=True, default=str).encode()).hexdigest()[:8]
+
+
+def result_timestamp(result: dict) -> str | None:
+    try:
+        return normalize_timestamp(result.get("content", {}).get("timestamp"))
+    except ValueError:
+        return None
+
+
+def result_id(result: dict) -> str:
+    return frame_key(result)[:ID_LENGTH]
+
+
+class SearchCursor:
+    """Position after the newest frame a query has returned"""
+
+    def __init__(self, timestamp: str, ids, query: str):
+        self.timestamp = timestamp
+        self.ids = set(ids)
+        self.query = query
+
+    def encode(self) -> str:
+        payload = json.dumps({"t": self.timestamp, "ids": sorted(self.ids), "q": self.query}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SearchCursor":
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return cls(normalize_timestamp(payload["t"]), payload["ids"], payload["q"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"invalid cursor: {e}") from None
+
+    def is_newer(self, result: dict) -> bool:
+        """Whether a result comes after this cursor (frames at the cursor timestamp count once)"""
+        timestamp = result_timestamp(result)
+        if timestamp is None:
+            return False
+        if timestamp != self.timestamp:
+            return timestamp > self.timestamp
+        return result_id(result) not in self.ids
+
+    @classmethod
+    def after(cls, results: list[dict], query: str, previous: "SearchCursor | None" = None) -> "SearchCursor | None":
+        """Cursor positioned after the newest of results (and previous, when given)"""
+        timestamp = previous.timestamp if previous else None
+        ids = set(previous.ids) if previous else set()
+        for result in results:
+            result_ts = result_timestamp(result)
+            if result_ts is None:
+                continue
+            if timestamp is None or result_ts > timestamp:
+                timestamp, ids = result_ts, {result_id(result)}
+            elif result_ts == timestamp:
+                ids.add(result_id(result))
+        if timestamp is None:
+            return None
+        return cls(timestamp, ids, query)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate collapsing of Screenpipe search results
+Screenpipe captures the same screen many times; each OCR/UI result is SimHash-fingerprinted and
+results within a few bits of an earlier one (same app, close in time) are folded into it.
+Candidates are found through banded fingerprint buckets, so one pass over a page is linear.
+"""
+
+import hashlib
+import re
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from screenpipe_defaults import DEFAULT_DEDUP_WINDOW_MINUTES
+from screenpipe_index import frame_text, to_utc
+
+# Fingerprints within this many differing bits are near-duplicates (a couple of OCR-garbled
+# words in a screenful of text typically moves a 64-bit SimHash by 2-7 bits)
+DEFAULT_MAX_DISTANCE = 7
+
+# 64-bit fingerprints are split into BANDS buckets; any two within BANDS - 1 bits share one
+BANDS = 8
+BAND_BITS = 64 // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# Most recent entries remembered per bucket; keeps each lookup constant time
+BUCKET_SIZE = 4
+
+# Audio transcriptions are not repeated captures of the same content, so only these are collapsed
+DEDUP_TYPES = {"OCR", "UI"}
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=65536)
+def token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int | None:
+    """64-bit SimHash of the words in text, or None when there are none"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return None
+    hashes = np.fromiter((token_hash(token) for token in tokens), dtype=">u8", count=len(tokens))
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(tokens)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+@dataclass
+class CollapsedResult:
+    """A search result standing in for itself and every near-duplicate folded into it"""
+    result: dict
+    fingerprint: int | None
+    first_seen: datetime | None
+    last_seen: datetime | None
+    count: int = 1
+
+    def add(self, timestamp: datetime | None):
+        self.count += 1
+        if timestamp is None:
+            return
+        if self.first_seen is None or timestamp < self.first_seen:
+            self.first_seen = timestamp
+        if self.last_seen is None or timestamp > self.last_seen:
+            self.last_seen = timestamp
+
+    def within(self, timestamp: datetime | None, window: timedelta) -> bool:
+        if timestamp is None or self.first_seen is None:
+            return True
+        return self.first_seen - window <= timestamp <= self.last_seen + window
+
+
+def collapse_near_duplicates(
+    results: list[dict],
+    window_minutes: float = DEFAULT_DEDUP_WINDOW_MINUTES,
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+) -> list[CollapsedResult]:
+    """
+    Fold near-duplicate OCR/UI results into the first occurrence, keeping result order.
+
+    Two results collapse when they have the same type and app, their fingerprints differ in at
+    most max_distance bits and they are within window_minutes. Candidates come from the
+    BUCKET_SIZE newest entries per band, which finds any match within BANDS - 1 bits unless
+    many other recent results share that band.
+    """
+    window = timedelta(minutes=window_minutes)
+    collapsed = []
+    buckets = {}
+    for result in results:
+        content = result.get("content", {})
+        try:
+            timestamp = to_utc(content.get("timestamp"))
+        except ValueError:
+            timestamp = None
+
+        fingerprint = simhash(frame_text(result)) if result.get("type") in DEDUP_TYPES else None
+        if fingerprint is None:
+            collapsed.append(CollapsedResult(result, None, timestamp, timestamp))
+            continue
+
+        scope = (result.get("type"), content.get("app_name"))
+        keys = [(scope, band, (fingerprint >> (band * BAND_BITS)) & BAND_MASK) for band in range(BANDS)]
+        match = None
+        for key in keys:
+            for candidate in buckets.get(key, ()):
+                if ((candidate.fingerprint ^ fingerprint).bit_count() <= max_distance
+                        and candidate.within(timestamp, window)):
+                    match = candidate
+                    break
+            if match is not None:
+                break
+
+        if match is not None:
+            match.add(timestamp)
+            continue
+
+        entry = CollapsedResult(result, fingerprint, timestamp, timestamp)
+        collapsed.append(entry)
+        for key in keys:
+            bucket = buckets.setdefault(key, deque(maxlen=BUCKET_SIZE))
+            bucket.appendleft(entry)
+    return collapsed
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Tool argument and option defaults for the Screenpipe MCP server
+Shared by the tool schemas, the command line and the modules that implement them. Kept free of
+imports so the server can start and list its tools without loading NumPy or the analytics modules.
+"""
+
+# Near-duplicate results captured further apart than this are kept separate (search-content)
+DEFAULT_DEDUP_WINDOW_MINUTES = 10
+
+# Longest gap between frames still counted as time in the app (analyze-productivity, rollups)
+DEFAULT_IDLE_CAP_SECONDS = 300
+
+# Minutes of inactivity that end a coding session (find-coding-sessions)
+DEFAULT_IDLE_GAP_MINUTES = 10
+
+# Hourly rollup store: history rolled up on first start, and seconds between checks for closed hours
+DEFAULT_ROLLUP_BACKFILL_HOURS = 24
+DEFAULT_ROLLUP_INTERVAL = 300.0
+
+# Background jobs (terminal tools): most running at once, and output kept per job in KB
+DEFAULT_MAX_JOBS = 4
+DEFAULT_JOB_OUTPUT_KB = 1024
+
+# Bytes of job output returned per job-output call
+DEFAULT_JOB_READ_BYTES = 16 * 1024
+
+# Persistent shell sessions (execute-terminal-command): most kept open at once
+DEFAULT_MAX_SHELL_SESSIONS = 4
+
+# Output of a terminal command kept in memory and returned, per stream in KB (head and tail);
+# the full output of longer streams is spilled to a file under logs/
+DEFAULT_OUTPUT_BUDGET_KB = 64
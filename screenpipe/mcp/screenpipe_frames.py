@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Columnar in-memory store for batches of Screenpipe frames
+Timestamps are one datetime64[ns] array, app and window names are interned into integer codes,
+and all text lives in a single buffer addressed by offsets, so analytics run as NumPy operations
+instead of walking lists of nested result dicts
+"""
+
+from array import array
+
+import numpy as np
+
+from screenpipe_screentime import frame_durations
+from screenpipe_timestamps import iso_strings, parse_timestamps
+
+# Content type codes; anything unrecognised is "unknown"
+TYPE_NAMES = ["ocr", "audio", "ui", "unknown"]
+TYPE_CODES = {"OCR": 0, "Audio": 1, "UI": 2}
+OCR, AUDIO, UI, UNKNOWN = range(len(TYPE_NAMES))
+
+
+class Categories:
+    """Interned string values; each distinct value gets a small integer code"""
+
+    def __init__(self):
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def matching_codes(values: list[str], needle: str) -> np.ndarray:
+    """Codes of the interned values containing needle (case-insensitive)"""
+    needle = needle.lower()
+    return np.array([code for code, value in enumerate(values) if needle in value.lower()], dtype=np.int32)
+
+
+class FrameBatch:
+    """
+    A batch of frames as parallel arrays.
+
+    Row i has timestamps[i] (NaT when unparseable), types[i] (see TYPE_NAMES), apps[i] and
+    windows[i] (codes into app_names / window_names) and text[starts[i]:ends[i]].
+    """
+
+    def __init__(self, timestamps, types, apps, windows, starts, ends, app_names, window_names, text=""):
+        self.timestamps = timestamps
+        self.types = types
+        self.apps = apps
+        self.windows = windows
+        self.starts = starts
+        self.ends = ends
+        self.app_names = app_names
+        self.window_names = window_names
+        self.text = text
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def text_at(self, i: int) -> str:
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def take(self, selection) -> "FrameBatch":
+        """Rows selected by a boolean mask or index array; categories and text buffer are shared"""
+        return FrameBatch(
+            self.timestamps[selection], self.types[selection], self.apps[selection], self.windows[selection],
+            self.starts[selection], self.ends[selection], self.app_names, self.window_names, self.text,
+        )
+
+    def valid(self) -> np.ndarray:
+        """Mask of rows with a usable timestamp"""
+        return ~np.isnat(self.timestamps)
+
+    def sorted(self) -> "FrameBatch":
+        """Rows ordered oldest first (stable, so equal timestamps keep their order)"""
+        return self.take(np.argsort(self.timestamps, kind="stable"))
+
+    def text_contains(self, needle: str) -> np.ndarray:
+        """Mask of rows whose text contains needle (case-insensitive), found with C-level str.find over the buffer"""
+        mask = np.zeros(len(self), dtype=bool)
+        needle = needle.lower()
+        if not needle or len(self) == 0:
+            return mask
+        haystack = self.text.lower()
+        if len(haystack) != len(self.text):
+            # Lower-casing changed some character widths, so buffer offsets no longer line up
+            return np.array([needle in self.text_at(i).lower() for i in range(len(self))], dtype=bool)
+
+        positions = []
+        position = haystack.find(needle)
+        while position != -1:
+            positions.append(position)
+            position = haystack.find(needle, position + 1)
+        if not positions:
+            return mask
+
+        # Rows may share or reorder buffer ranges after take(), so test every row against the hits
+        positions = np.array(positions, dtype=np.int64)
+        first_hit = np.searchsorted(positions, self.starts, side="left")
+        hit = first_hit < len(positions)
+        mask[hit] = positions[first_hit[hit]] + len(needle) <= self.ends[hit]
+        return mask
+
+    def window_contains(self, needle: str) -> np.ndarray:
+        """Mask of rows whose window name contains needle (case-insensitive), matched once per distinct name"""
+        return np.isin(self.windows, matching_codes(self.window_names, needle))
+
+
+class FrameBatchBuilder:
+    """Accumulates /search result pages into a FrameBatch"""
+
+    def __init__(self, keep_text: bool = True):
+        self.keep_text = keep_text
+        self.app_categories = Categories()
+        self.window_categories = Categories()
+        self._timestamps = []
+        # Compact typed arrays while building rather than lists of Python ints
+        self._types = array("b")
+        self._apps = array("i")
+        self._windows = array("i")
+        self._texts = []
+        # Rows whose timestamp could not be parsed (kept in the batch as NaT)
+        self.unparsed = 0
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def add_page(self, page: list[dict], app_name: str | None = None):
+        """
+        Append one page of results. app_name overrides each result's own app (used when a page
+        is the answer to a per-app query); otherwise the app falls back to the device, then "Unknown".
+        """
+        raw_timestamps = []
+        app_code = self.app_categories.code(app_name) if app_name else None
+        for result in page:
+            content = result.get("content", {})
+            raw_timestamps.append(content.get("timestamp"))
+            self._types.append(TYPE_CODES.get(result.get("type"), UNKNOWN))
+            self._apps.append(app_code if app_code is not None else self.app_categories.code(
+                content.get("app_name") or content.get("device_name") or "Unknown"
+            ))
+            self._windows.append(self.window_categories.code(content.get("window_name") or ""))
+            if self.keep_text:
+                if result.get("type") == "Audio":
+                    self._texts.append(content.get("transcription") or "")
+                else:
+                    self._texts.append(content.get("text") or "")
+        timestamps, unparsed = parse_timestamps(raw_timestamps)
+        self._timestamps.append(timestamps)
+        self.unparsed += unparsed
+
+    def build(self) -> FrameBatch:
+        count = len(self._types)
+        lengths = np.fromiter((len(text) for text in self._texts), dtype=np.int64, count=len(self._texts))
+        ends = np.cumsum(lengths) if self.keep_text else np.zeros(count, dtype=np.int64)
+        starts = ends - lengths if self.keep_text else ends
+        timestamps = np.concatenate(self._timestamps) if self._timestamps else np.empty(0, dtype="datetime64[ns]")
+        return FrameBatch(
+            timestamps,
+            np.frombuffer(self._types, dtype=np.int8).copy(),
+            np.frombuffer(self._apps, dtype=np.int32).copy(),
+            np.frombuffer(self._windows, dtype=np.int32).copy(),
+            starts,
+            ends,
+            self.app_categories.values,
+            self.window_categories.values,
+            "".join(self._texts),
+        )
+
+
+def rollup_rows(batch: FrameBatch, idle_cap_seconds: float | None = None, range_end=None) -> tuple[dict, int]:
+    """
+    Group a batch by (hour, app, content type) into rollup rows [frames, first_seen, last_seen, seconds].
+
+    When idle_cap_seconds is given, OCR rows also get time-weighted screen time: each OCR frame
+    (ordered across all apps) owns the gap to the next one, capped, and the last runs to range_end.
+    Returns the rows and how many frames had no usable timestamp.
+    """
+    valid = batch.valid()
+    skipped = int(len(batch) - valid.sum())
+    if skipped:
+        batch = batch.take(valid)
+    if len(batch) == 0:
+        return {}, skipped
+
+    timestamps = batch.timestamps
+    hour_values, hour_codes = np.unique(timestamps.astype("datetime64[h]"), return_inverse=True)
+    app_count, type_count = len(batch.app_names), len(TYPE_NAMES)
+    combined = (hour_codes.astype(np.int64) * app_count + batch.apps) * type_count + batch.types
+
+    # Sort by group, then time, so each group is one contiguous run with its first/last frame at the ends
+    order = np.lexsort((timestamps, combined))
+    groups = combined[order]
+    ordered_timestamps = timestamps[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    ends = np.r_[starts[1:], len(groups)]
+    group_keys = groups[starts]
+
+    seconds = np.zeros(len(starts))
+    if idle_cap_seconds is not None:
+        ocr = np.flatnonzero(batch.types == OCR)
+        if len(ocr):
+            ocr = ocr[np.argsort(timestamps[ocr], kind="stable")]
+            if range_end is not None and not isinstance(range_end, np.datetime64):
+                range_end = parse_timestamps([range_end])[0][0]
+            durations = frame_durations(timestamps[ocr], idle_cap_seconds, range_end)
+            group_index = np.searchsorted(group_keys, combined[ocr])
+            seconds = np.bincount(group_index, weights=durations, minlength=len(starts))
+
+    hour_keys = iso_strings(hour_values)
+    firsts = iso_strings(ordered_timestamps[starts])
+    lasts = iso_strings(ordered_timestamps[ends - 1])
+    counts = ends - starts
+
+    rows = {}
+    for i, key in enumerate(group_keys.tolist()):
+        rest, type_code = divmod(key, type_count)
+        hour_code, app_code = divmod(rest, app_count)
+        rows[(hour_keys[hour_code], batch.app_names[app_code], TYPE_NAMES[type_code])] = [
+            int(counts[i]), firsts[i], lasts[i], float(seconds[i])
+        ]
+    return rows, skipped
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Local SQLite/FTS5 mirror of Screenpipe content
+Keeps OCR, audio and UI frames under data_path in sync with the Screenpipe API using a time cursor,
+so repeated queries over the same windows are answered locally and only the unsynced tail goes upstream.
+Database work runs in worker threads so inserts and large queries never block the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+INDEX_FILENAME = "screenpipe_index.db"
+
+# Defaults for the background sync (override from the server command line)
+DEFAULT_BACKFILL_HOURS = 24
+DEFAULT_SYNC_INTERVAL = 60.0
+# Frames older than this are pruned on each sync (0 keeps everything); older queries go upstream
+DEFAULT_RETENTION_HOURS = 7 * 24
+SYNC_PAGE_SIZE = 500
+
+# Frames can be written upstream slightly after their timestamp (OCR runs asynchronously),
+# so each sync re-reads a short overlap behind the cursor; duplicates are ignored by frame_key
+SYNC_OVERLAP = timedelta(seconds=120)
+
+CONTENT_TYPES = {"ocr": "OCR", "audio": "Audio", "ui": "UI"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frames (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    frame_key TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    app_name TEXT,
+    window_name TEXT,
+    device_name TEXT,
+    text TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_frames_timestamp ON frames(timestamp);
+CREATE INDEX IF NOT EXISTS idx_frames_type_timestamp ON frames(type, timestamp);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS frames_fts USING fts5(
+    text, app_name, window_name,
+    content='frames', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS frames_ai AFTER INSERT ON frames BEGIN
+    INSERT INTO frames_fts(rowid, text, app_name, window_name)
+    VALUES (new.id, new.text, new.app_name, new.window_name);
+END;
+CREATE TRIGGER IF NOT EXISTS frames_ad AFTER DELETE ON frames BEGIN
+    INSERT INTO frames_fts(frames_fts, rowid, text, app_name, window_name)
+    VALUES ('delete', old.id, old.text, old.app_name, old.window_name);
+END;
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def to_utc(value) -> datetime | None:
+    """Parse an ISO timestamp (or datetime) into an aware UTC datetime"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def format_utc(dt: datetime) -> str:
+    """Fixed-width UTC timestamp so stored values sort and compare lexically"""
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def normalize_timestamp(value) -> str | None:
+    dt = to_utc(value)
+    return format_utc(dt) if dt else None
+
+
+def frame_text(result: dict) -> str:
+    content = result.get("content", {})
+    if result.get("type") == "Audio":
+        return content.get("transcription", "") or ""
+    return content.get("text", "") or ""
+
+
+def frame_key(result: dict) -> str:
+    """Stable identity for a search result so overlapping syncs do not duplicate rows"""
+    content = result.get("content", {})
+    identity = [
+        result.get("type", ""),
+        content.get("timestamp", ""),
+        content.get("frame_id") or content.get("chunk_id") or content.get("id") or "",
+        content.get("app_name", "") or content.get("device_name", ""),
+        frame_text(result),
+    ]
+    return hashlib.sha1(json.dumps(identity, default=str).encode()).hexdigest()
+
+
+async def fetch_page(client, api_url: str, params: dict, timeout: float) -> list[dict]:
+    """One /search request; returns the result rows"""
+    response = await client.get(f"{api_url}/search", params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json().get("data", [])
+
+
+async def iter_upstream_pages(client, api_url: str, params: dict, page_size: int, timeout: float = 30.0):
+    """Walk a /search query page by page with offsets, yielding each non-empty page"""
+    offset = 0
+    while True:
+        page = await fetch_page(client, api_url, {**params, "limit": page_size, "offset": offset}, timeout)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+
+def fts_query(q: str) -> str:
+    """Quote each search term so user input cannot inject FTS5 operators"""
+    terms = [term.replace('"', '""') for term in q.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
+
+
+class FrameIndex:
+    """
+    On-disk mirror of Screenpipe /search results with a time-cursor incremental sync.
+
+    The async methods run their SQLite work through asyncio.to_thread on the one connection
+    (SQLite serializes it); the sync cursor is also kept in memory so reading it never waits on a query.
+    """
+
+    def __init__(self, db_path: Path, backfill_hours: float = DEFAULT_BACKFILL_HOURS,
+                 retention_hours: float = DEFAULT_RETENTION_HOURS):
+        self.db_path = Path(db_path)
+        self.backfill_hours = backfill_hours
+        self.retention_hours = retention_hours
+        # Rows pruned by retention since this index was opened
+        self.pruned = 0
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._synced_from = to_utc(self._get_state("synced_from"))
+        self._synced_until = to_utc(self._get_state("synced_until"))
+
+    def close(self):
+        self.conn.close()
+
+    # --- sync state -------------------------------------------------------
+
+    def _get_state(self, key: str) -> str | None:
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value: str):
+        self.conn.execute(
+            "INSERT INTO sync_state(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    @property
+    def synced_from(self) -> datetime | None:
+        """Oldest instant the mirror is complete for"""
+        return self._synced_from
+
+    @property
+    def synced_until(self) -> datetime | None:
+        """Newest instant the mirror is complete up to (the sync cursor)"""
+        return self._synced_until
+
+    # --- writes -----------------------------------------------------------
+
+    def add_results(self, results: list[dict]) -> int:
+        """Insert raw /search results, ignoring ones already mirrored; returns rows added"""
+        rows = []
+        for result in results:
+            content = result.get("content")
+            if not content or result.get("type") not in CONTENT_TYPES.values():
+                continue
+            try:
+                timestamp = normalize_timestamp(content.get("timestamp"))
+            except ValueError:
+                continue
+            if timestamp is None:
+                continue
+            rows.append((
+                frame_key(result),
+                result["type"],
+                timestamp,
+                content.get("app_name"),
+                content.get("window_name"),
+                content.get("device_name"),
+                frame_text(result),
+                json.dumps(result),
+            ))
+        with self.conn:
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO frames(frame_key, type, timestamp, app_name, window_name, device_name, text, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return max(cursor.rowcount, 0)
+
+    async def sync(self, client, api_url: str, timeout: float = 30.0, page_size: int = SYNC_PAGE_SIZE) -> int:
+        """Pull everything between the cursor and now from /search, then prune past retention; returns frames added"""
+        sync_end = datetime.now(timezone.utc)
+        prune_before = sync_end - timedelta(hours=self.retention_hours) if self.retention_hours else None
+        synced_until = self.synced_until
+        if synced_until is None:
+            start = sync_end - timedelta(hours=self.backfill_hours)
+            # Never backfill what retention would drop straight away
+            if prune_before:
+                start = max(start, prune_before)
+        else:
+            start = synced_until - SYNC_OVERLAP
+
+        added = 0
+        params = {
+            "content_type": "all",
+            "start_time": format_utc(start),
+            "end_time": format_utc(sync_end),
+        }
+        async for page in iter_upstream_pages(client, api_url, params, page_size, timeout):
+            added += await asyncio.to_thread(self.add_results, page)
+
+        await asyncio.to_thread(self._advance, start, sync_end, prune_before)
+        return added
+
+    def _advance(self, start: datetime, sync_end: datetime, prune_before: datetime | None = None):
+        """Record a completed sync of [start, sync_end], deleting frames older than prune_before"""
+        synced_from = self._synced_from or start
+        pruned = 0
+        with self.conn:
+            if prune_before:
+                # The FTS rows go with them (frames_ad trigger); freed pages are reused by later syncs
+                cursor = self.conn.execute("DELETE FROM frames WHERE timestamp < ?", (format_utc(prune_before),))
+                pruned = max(cursor.rowcount, 0)
+                synced_from = max(synced_from, prune_before)
+            self._set_state("synced_from", format_utc(synced_from))
+            self._set_state("synced_until", format_utc(sync_end))
+        self._synced_from = synced_from
+        self._synced_until = sync_end
+        self.pruned += pruned
+
+    # --- reads ------------------------------------------------------------
+
+    def _select(self, params: dict, before: datetime | None = None) -> tuple[str, list]:
+        """
+        Translate /search parameters into a newest-first SELECT over the mirror, filtering the way
+        /search does. before (exclusive) cuts off what an upstream tail from that instant returns.
+        """
+        clauses = []
+        values = []
+        join = ""
+
+        q = params.get("q")
+        if q and fts_query(q):
+            join = "JOIN frames_fts ON frames_fts.rowid = frames.id"
+            clauses.append("frames_fts MATCH ?")
+            values.append(fts_query(q))
+
+        content_type = (params.get("content_type") or "all").lower()
+        if content_type in CONTENT_TYPES:
+            clauses.append("frames.type = ?")
+            values.append(CONTENT_TYPES[content_type])
+
+        start = to_utc(params.get("start_time"))
+        if start:
+            clauses.append("frames.timestamp >= ?")
+            values.append(format_utc(start))
+        end = to_utc(params.get("end_time"))
+        if end:
+            clauses.append("frames.timestamp <= ?")
+            values.append(format_utc(end))
+        if before:
+            clauses.append("frames.timestamp < ?")
+            values.append(format_utc(before))
+
+        # Like /search: the app name must match exactly (ignoring case), the window name may be part of the title
+        if params.get("app_name"):
+            clauses.append("frames.app_name = ? COLLATE NOCASE")
+            values.append(params["app_name"])
+        if params.get("window_name"):
+            clauses.append("frames.window_name LIKE ?")
+            values.append(f"%{params['window_name']}%")
+
+        if params.get("min_length") is not None:
+            clauses.append("length(frames.text) >= ?")
+            values.append(int(params["min_length"]))
+        if params.get("max_length") is not None:
+            clauses.append("length(frames.text) <= ?")
+            values.append(int(params["max_length"]))
+
+        sql = f"SELECT frames.raw FROM frames {join}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY frames.timestamp DESC"
+        return sql, values
+
+    def search(self, params: dict, limit: int | None = None, offset: int = 0, before: datetime | None = None) -> list[dict]:
+        """Answer a /search style query from the mirror, newest first"""
+        sql, values = self._select(params, before)
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            values.extend([int(limit), int(offset)])
+        return [json.loads(row["raw"]) for row in self.conn.execute(sql, values)]
+
+    async def iter_search(self, params: dict, page_size: int, before: datetime | None = None):
+        """Stream a mirror query in pages from one cursor, holding only one page in memory"""
+        sql, values = self._select(params, before)
+        cursor = await asyncio.to_thread(self.conn.execute, sql, values)
+        try:
+            while True:
+                page = await asyncio.to_thread(self._fetch_page, cursor, page_size)
+                if not page:
+                    return
+                yield page
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _fetch_page(cursor: sqlite3.Cursor, page_size: int) -> list[dict]:
+        return [json.loads(row["raw"]) for row in cursor.fetchmany(page_size)]
+
+    async def query(self, client, api_url: str, params: dict, timeout: float = 30.0) -> tuple[list[dict], str]:
+        """
+        Run a /search query against the mirror, going upstream only for what the mirror lacks.
+        Returns (results, source) where source is 'index', 'index+upstream' or 'upstream'.
+        """
+        limit = int(params.get("limit", 20))
+        offset = int(params.get("offset", 0))
+        start = to_utc(params.get("start_time"))
+        end = to_utc(params.get("end_time"))
+        synced_from, synced_until = self.synced_from, self.synced_until
+
+        # Window starts before the mirror (or is unbounded): the index cannot answer it
+        if synced_from is None or synced_until is None or start is None or start < synced_from:
+            return await fetch_page(client, api_url, params, timeout), "upstream"
+
+        if end is not None and end <= synced_until:
+            return await asyncio.to_thread(self.search, params, limit, offset), "index"
+
+        # Local part before the cursor, plus the unsynced tail from upstream from the cursor on.
+        # Both are newest first and the tail is strictly newer, so the merged page is tail + local.
+        wanted = offset + limit
+        tail_params = {
+            **params,
+            "start_time": format_utc(max(start, synced_until)),
+            "limit": wanted,
+            "offset": 0,
+        }
+        tail = await fetch_page(client, api_url, tail_params, timeout)
+        local = await asyncio.to_thread(self.search, params, max(wanted - len(tail), 0), 0, synced_until)
+        return (tail + local)[offset:offset + limit], "index+upstream"
+
+    async def iter_pages(self, client, api_url: str, params: dict, page_size: int, timeout: float = 30.0):
+        """
+        Stream every result of a /search query page by page, newest first: the unsynced tail
+        from upstream, then the synced part from the mirror. limit and offset are ignored.
+        """
+        params = {k: v for k, v in params.items() if k not in ("limit", "offset")}
+        start = to_utc(params.get("start_time"))
+        end = to_utc(params.get("end_time"))
+        synced_from, synced_until = self.synced_from, self.synced_until
+
+        if synced_from is None or synced_until is None or start is None or start < synced_from:
+            async for page in iter_upstream_pages(client, api_url, params, page_size, timeout):
+                yield page
+            return
+
+        before = None
+        if end is None or end > synced_until:
+            tail_params = {**params, "start_time": format_utc(max(start, synced_until))}
+            async for page in iter_upstream_pages(client, api_url, tail_params, page_size, timeout):
+                yield page
+            # The tail included frames stamped exactly at the cursor
+            before = synced_until
+
+        async for page in self.iter_search(params, page_size, before):
+            yield page
+
+    def stats(self) -> dict:
+        """Size and coverage of the mirror (counts rows, so call it off the event loop)"""
+        row = self.conn.execute("SELECT COUNT(*) AS frames FROM frames").fetchone()
+        synced_from, synced_until = self.synced_from, self.synced_until
+        size = sum(path.stat().st_size for path in self.db_path.parent.glob(f"{self.db_path.name}*"))
+        return {
+            "frames": row["frames"],
+            "bytes": size,
+            "synced_from": format_utc(synced_from) if synced_from else None,
+            "synced_until": format_utc(synced_until) if synced_until else None,
+            "retention_hours": self.retention_hours,
+            "pruned": self.pruned,
+        }
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Background jobs for the Screenpipe MCP server's terminal tools
+A job is a shell command left running after the tool call that started it returns. Its
+interleaved stdout/stderr streams into a fixed-size ring buffer addressed by absolute byte
+offset, so clients poll new output cheaply and a chatty job never holds more than its cap.
+"""
+
+import asyncio
+import itertools
+import time
+
+from screenpipe_defaults import DEFAULT_JOB_OUTPUT_KB, DEFAULT_MAX_JOBS
+from screenpipe_process import SIGCONT, SIGKILL, SIGSTOP, signal_process_group, start_process, terminate_process_group
+
+# Bytes read from a job's pipe at a time
+READ_CHUNK = 64 * 1024
+
+# Finished jobs kept for job-status/job-output before the oldest are forgotten
+MAX_FINISHED_JOBS = 16
+
+RUNNING = "running"
+EXITED = "exited"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed out"
+
+
+class JobLimitError(Exception):
+    """Raised when starting a job would exceed the concurrent job limit"""
+
+
+class RingBuffer:
+    """The last `capacity` bytes of a stream, addressed by offset from the start of the stream"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(int(capacity), 1)
+        self.total = 0
+        # Grows up to capacity, then wraps: the byte at offset x lives at x % capacity
+        self._data = bytearray()
+
+    @property
+    def start(self) -> int:
+        """Offset of the oldest byte still held"""
+        return max(self.total - self.capacity, 0)
+
+    def write(self, chunk: bytes):
+        if len(self._data) < self.capacity:
+            room = self.capacity - len(self._data)
+            self._data += chunk[:room]
+            self.total += min(len(chunk), room)
+            chunk = chunk[room:]
+        if not chunk:
+            return
+        if len(chunk) > self.capacity:
+            # Only the tail of an oversized chunk survives
+            self.total += len(chunk) - self.capacity
+            chunk = chunk[-self.capacity:]
+        position = self.total % self.capacity
+        first = min(len(chunk), self.capacity - position)
+        self._data[position:position + first] = chunk[:first]
+        self._data[:len(chunk) - first] = chunk[first:]
+        self.total += len(chunk)
+
+    def read(self, offset: int, limit: int) -> tuple[bytes, int]:
+        """Up to limit bytes from offset (moved up to start if already dropped); returns (data, offset)"""
+        offset = min(max(offset, self.start), self.total)
+        size = max(min(limit, self.total - offset), 0)
+        position = offset % self.capacity
+        if position + size <= len(self._data):
+            return bytes(self._data[position:position + size]), offset
+        return bytes(self._data[position:] + self._data[:position + size - len(self._data)]), offset
+
+
+class Job:
+    """One background shell command and its captured output"""
+
+    def __init__(self, job_id: str, command: str, process, output_bytes: int, cwd=None, timeout=None):
+        self.id = job_id
+        self.command = command
+        self.process = process
+        self.output = RingBuffer(output_bytes)
+        self.cwd = cwd
+        self.timeout = timeout
+        self.state = RUNNING
+        # Suspended with Ctrl-Z (send-control-character) and not yet resumed
+        self.stopped = False
+        self.started = time.time()
+        self.ended = None
+        self.task = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def returncode(self):
+        return self.process.returncode
+
+    @property
+    def running(self) -> bool:
+        return self.state == RUNNING
+
+    @property
+    def elapsed(self) -> float:
+        return (self.ended or time.time()) - self.started
+
+    def send_signal(self, sig: int) -> bool:
+        """Signal the job's whole process group; False once the job has finished"""
+        if not self.running or not signal_process_group(self.process, sig):
+            return False
+        if sig == SIGSTOP:
+            self.stopped = True
+        elif sig == SIGCONT:
+            self.stopped = False
+        return True
+
+    def describe(self) -> str:
+        """One line: id, state, pid, runtime, output size and command"""
+        state = self.state
+        if self.state == EXITED:
+            state = f"exited {self.returncode}"
+        elif self.running and self.stopped:
+            state = "stopped"
+        return (
+            f"{self.id} [{state}] pid {self.pid}, {self.elapsed:.1f}s, "
+            f"{self.output.total} bytes output: {self.command}"
+        )
+
+
+class JobManager:
+    """The server's job table: starts, tracks, caps and cancels background jobs"""
+
+    def __init__(self, max_jobs: int = DEFAULT_MAX_JOBS, max_output_bytes: int = DEFAULT_JOB_OUTPUT_KB * 1024):
+        self.max_jobs = max(max_jobs, 1)
+        self.max_output_bytes = max_output_bytes
+        self.jobs: dict[str, Job] = {}
+        self._ids = itertools.count(1)
+        # Slots reserved by starts still awaiting their process, so concurrent starts can't overshoot
+        self._starting = 0
+
+    def running(self) -> list[Job]:
+        return [job for job in self.jobs.values() if job.running]
+
+    def get(self, job_id: str) -> Job:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"no such job: {job_id}")
+        return job
+
+    async def start(self, command: str, cwd=None, timeout: float | None = None) -> Job:
+        """Start command in a shell of its own process group and begin capturing its output"""
+        if len(self.running()) + self._starting >= self.max_jobs:
+            raise JobLimitError(f"{self.max_jobs} jobs already running (the limit); cancel one or wait for one to finish")
+        self._starting += 1
+        try:
+            process = await start_process(
+                command,
+                shell=True,
+                cwd=cwd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.STDOUT,
+            )
+        finally:
+            self._starting -= 1
+        job = Job(f"job-{next(self._ids)}", command, process, self.max_output_bytes, cwd=cwd, timeout=timeout)
+        job.task = asyncio.create_task(self._supervise(job))
+        self.jobs[job.id] = job
+        self._forget_finished()
+        return job
+
+    async def _pump(self, job: Job):
+        while True:
+            chunk = await job.process.stdout.read(READ_CHUNK)
+            if not chunk:
+                break
+            job.output.write(chunk)
+        await job.process.wait()
+
+    async def _supervise(self, job: Job):
+        try:
+            await asyncio.wait_for(self._pump(job), job.timeout)
+        except asyncio.TimeoutError:
+            job.state = TIMED_OUT
+            await terminate_process_group(job.process)
+        except asyncio.CancelledError:
+            signal_process_group(job.process, SIGKILL)
+            raise
+        finally:
+            if job.state == RUNNING:
+                job.state = EXITED
+            job.ended = time.time()
+
+    async def cancel(self, job_id: str) -> Job:
+        """Terminate a running job's whole process group and wait for it to exit"""
+        job = self.get(job_id)
+        if job.running:
+            job.state = CANCELLED
+            await terminate_process_group(job.process)
+            await asyncio.gather(job.task, return_exceptions=True)
+        return job
+
+    def _forget_finished(self):
+        finished = [job for job in self.jobs.values() if not job.running]
+        for job in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job.id]
+
+    async def close(self):
+        """Kill every running job (server shutdown)"""
+        for job in self.running():
+            job.state = CANCELLED
+            signal_process_group(job.process, SIGKILL)
+        await asyncio.gather(*(job.task for job in self.jobs.values() if job.task), return_exceptions=True)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Buffered background log writer for the Screenpipe MCP servers
+Callers only enqueue a line; a writer thread keeps the log file open, writes in batches and
+rotates by size, so logging never blocks the event loop or opens the file per message
+"""
+
+import atexit
+import contextlib
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+DEFAULT_MAX_BUFFER = 10_000
+DEFAULT_BATCH_SIZE = 512
+
+_STOP = object()
+
+
+class BufferedLogWriter:
+    """Queue-backed log file writer with batching, size-based rotation and a bounded buffer"""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        max_buffer: int = DEFAULT_MAX_BUFFER,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="mcp-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, message: str):
+        """Queue one log line; drops it (and counts the drop) when the buffer is full"""
+        line = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}\n"
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def close(self, timeout: float = 5.0):
+        """Flush everything queued so far and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # --- writer thread ----------------------------------------------------
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            lines = [item for item in batch if item is not _STOP]
+
+            with self._lock:
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                lines.append(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] log buffer full, dropped {dropped} messages\n")
+
+            try:
+                self._write("".join(lines))
+            except OSError:
+                # Never let a logging failure take the writer down; the next batch retries the open
+                self._drop_file()
+
+            if stop:
+                if self._file:
+                    self._file.close()
+                return
+
+    def _drop_file(self):
+        """Close the log file after a failed write or rotation (it may already be broken)"""
+        file, self._file = self._file, None
+        if file:
+            with contextlib.suppress(OSError):
+                file.close()
+
+    def _write(self, text: str):
+        if not text:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._size = self._file.tell()
+        self._file.write(text)
+        self._file.flush()
+        self._size += len(text) if text.isascii() else len(text.encode("utf-8"))
+        if self.max_bytes and self._size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{i}")
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{i + 1}"))
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+
+
+def add_logging_arguments(parser):
+    """Add the shared log file flags to a server's argument parser"""
+    parser.add_argument('--log-max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                        help=f'Rotate the MCP log file once it reaches this many bytes (default: {DEFAULT_MAX_BYTES})')
+    parser.add_argument('--log-backups', type=int, default=DEFAULT_BACKUP_COUNT,
+                        help=f'Rotated log files to keep (default: {DEFAULT_BACKUP_COUNT})')
+    parser.add_argument('--log-buffer', type=int, default=DEFAULT_MAX_BUFFER,
+                        help=f'Log lines buffered in memory before new ones are dropped (default: {DEFAULT_MAX_BUFFER})')
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Per-tool latency, upstream time, payload size and error metrics for the Screenpipe MCP servers
+Wraps the call_tool handler and hooks the shared httpx client; upstream requests are attributed
+to the tool whose call issued them through a context variable
+"""
+
+import json
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+METRICS_FILENAME = "mcp_metrics.json"
+
+# Latency samples kept per tool; percentiles are over this rolling window
+DEFAULT_WINDOW = 1024
+
+# Requests made outside any tool call (index sync, rollups) are recorded under this name
+BACKGROUND = "(background)"
+
+# Tools report failures as text rather than raising: a result that opens with one of these
+# status marks (terminal, control and status tools) or prefixes (the rest) is an error
+ERROR_MARKS = ("❌", "⚠️")
+ERROR_PREFIXES = ("failed to", "error")
+
+current_tool: ContextVar[str | None] = ContextVar("current_tool", default=None)
+
+
+def is_error_text(text: str) -> bool:
+    """Whether a tool's first text block reports a failure"""
+    text = text.lstrip()
+    return text.startswith(ERROR_MARKS) or text.lower().startswith(ERROR_PREFIXES)
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class ToolStats:
+    """Counters and a rolling latency window for one tool"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.response_bytes = 0
+        self.upstream_requests = 0
+        self.upstream_errors = 0
+        self.upstream_seconds = 0.0
+        self.upstream_bytes = 0
+        self.latencies = deque(maxlen=window)
+        self.last_error = None
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "latency_ms": {
+                "mean": round(self.total_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+                "p50": round(percentile(ordered, 0.50) * 1000, 2),
+                "p95": round(percentile(ordered, 0.95) * 1000, 2),
+                "p99": round(percentile(ordered, 0.99) * 1000, 2),
+                "window": len(ordered),
+            },
+            "response_bytes": self.response_bytes,
+            "upstream": {
+                "requests": self.upstream_requests,
+                "errors": self.upstream_errors,
+                "seconds": round(self.upstream_seconds, 3),
+                "bytes": self.upstream_bytes,
+            },
+        }
+
+
+class ToolMetrics:
+    """Registry of per-tool stats for one server process"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.tools: dict[str, ToolStats] = {}
+        self.started = datetime.now()
+
+    def stats(self, name: str) -> ToolStats:
+        stats = self.tools.get(name)
+        if stats is None:
+            stats = self.tools[name] = ToolStats(self.window)
+        return stats
+
+    def instrument(self, handler):
+        """Decorate a call_tool handler(name, arguments) so every call is timed and counted"""
+
+        @wraps(handler)
+        async def wrapper(name, arguments):
+            token = current_tool.set(name)
+            started = time.perf_counter()
+            stats = self.stats(name)
+            try:
+                result = await handler(name, arguments)
+            except Exception as e:
+                stats.errors += 1
+                stats.last_error = str(e)
+                raise
+            else:
+                texts = [getattr(item, "text", None) or "" for item in result or []]
+                stats.response_bytes += sum(len(text.encode("utf-8")) for text in texts)
+                if texts and is_error_text(texts[0]):
+                    stats.errors += 1
+                    stats.last_error = texts[0][:200]
+                return result
+            finally:
+                elapsed = time.perf_counter() - started
+                stats.calls += 1
+                stats.total_seconds += elapsed
+                stats.latencies.append(elapsed)
+                current_tool.reset(token)
+
+        return wrapper
+
+    # --- httpx event hooks --------------------------------------------------
+
+    async def _on_request(self, request):
+        request.extensions["metrics_started"] = time.perf_counter()
+
+    async def _on_response(self, response):
+        # Reading here keeps body transfer inside the measured time; callers read the body anyway
+        stats = self.stats(current_tool.get() or BACKGROUND)
+        try:
+            await response.aread()
+            stats.upstream_bytes += len(response.content)
+        finally:
+            started = response.request.extensions.get("metrics_started")
+            stats.upstream_requests += 1
+            if response.is_error:
+                stats.upstream_errors += 1
+            if started is not None:
+                stats.upstream_seconds += time.perf_counter() - started
+
+    @property
+    def event_hooks(self) -> dict:
+        """Hooks to install on the shared httpx client"""
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    # --- reporting ----------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        return {
+            "started": self.started.isoformat(),
+            "uptime_seconds": round((datetime.now() - self.started).total_seconds(), 1),
+            "tools": {name: stats.snapshot() for name, stats in sorted(self.tools.items())},
+        }
+
+    def dump(self, path: Path) -> Path:
+        """Write the current snapshot as JSON"""
+        path = Path(path)
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+    def format_report(self) -> str:
+        snapshot = self.snapshot()
+        lines = [f"Server metrics (since {snapshot['started'][:19]}, {snapshot['uptime_seconds']:.0f}s uptime)", ""]
+        if not snapshot["tools"]:
+            lines.append("No tool calls recorded yet")
+            return "\n".join(lines)
+
+        lines.append(f"{'tool':<24}{'calls':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+                     f"{'upstream s':>12}{'req':>6}{'in KB':>9}{'out KB':>9}")
+        for name, stats in snapshot["tools"].items():
+            latency, upstream = stats["latency_ms"], stats["upstream"]
+            lines.append(
+                f"{name:<24}{stats['calls']:>7}{stats['errors']:>8}{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}"
+                f"{upstream['seconds']:>12}{upstream['requests']:>6}{upstream['bytes'] / 1024:>9.1f}{stats['response_bytes'] / 1024:>9.1f}"
+            )
+        errors = [(name, stats["last_error"]) for name, stats in snapshot["tools"].items() if stats["last_error"]]
+        if errors:
+            lines.append("")
+            lines.append("Last errors:")
+            lines.extend(f"- {name}: {error}" for name, error in errors)
+        return "\n".join(lines)
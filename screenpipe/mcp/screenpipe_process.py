@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Asynchronous subprocesses for the Screenpipe MCP server's terminal and control tools
+Commands run as asyncio subprocesses, so a slow one never blocks the event loop. Each starts
+in its own session, so on timeout or cancellation the whole process group is killed: the
+shell and everything it started, not just the direct child.
+"""
+
+import asyncio
+import os
+import signal
+from dataclasses import dataclass
+
+from screenpipe_capture import OutputCapture, capture_stream
+
+# Seconds a timed-out process group gets between SIGTERM and SIGKILL
+KILL_GRACE_SECONDS = 2.0
+
+# SIGKILL does not exist on Windows, where terminating is already forceful
+SIGKILL = getattr(signal, "SIGKILL", signal.SIGTERM)
+
+# Suspend and resume (send-control-character); None on Windows, which has neither. Suspending
+# uses SIGSTOP: our process groups lead their own sessions, so the kernel discards SIGTSTP sent to them
+SIGSTOP = getattr(signal, "SIGSTOP", None)
+SIGCONT = getattr(signal, "SIGCONT", None)
+
+# Windows has no process groups to signal; the direct child is all that can be reached there
+HAS_PROCESS_GROUPS = hasattr(os, "killpg")
+
+
+@dataclass
+class ProcessResult:
+    returncode: int | None
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    # Bytes written to stdout and stderr, and the spill files of streams that outgrew the capture budget
+    output_bytes: int = 0
+    spill_files: tuple = ()
+
+    @classmethod
+    def captured(cls, returncode, stdout: OutputCapture, stderr: OutputCapture, timed_out: bool = False):
+        return cls(
+            returncode,
+            stdout.text(),
+            stderr.text(),
+            timed_out=timed_out,
+            output_bytes=stdout.total + stderr.total,
+            spill_files=tuple(str(c.spill_path) for c in (stdout, stderr) if c.spill_path),
+        )
+
+
+async def start_process(command, shell: bool = False, **kwargs) -> asyncio.subprocess.Process:
+    """Start argv (or a shell command line) as the leader of a new process group"""
+    options = {"stdout": asyncio.subprocess.PIPE, "stderr": asyncio.subprocess.PIPE, **kwargs}
+    if HAS_PROCESS_GROUPS:
+        options["start_new_session"] = True
+    if shell:
+        return await asyncio.create_subprocess_shell(command, **options)
+    return await asyncio.create_subprocess_exec(*command, **options)
+
+
+def signal_process_group(process: asyncio.subprocess.Process, sig: int) -> bool:
+    """Send sig to every process in the group process leads; False once the group is gone"""
+    try:
+        if HAS_PROCESS_GROUPS:
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+async def terminate_process_group(process: asyncio.subprocess.Process, grace: float = KILL_GRACE_SECONDS):
+    """SIGTERM the group, then SIGKILL whatever is left of it after grace seconds"""
+    if signal_process_group(process, signal.SIGTERM):
+        # A stopped (Ctrl-Z) group only acts on SIGTERM once continued
+        if SIGCONT:
+            signal_process_group(process, SIGCONT)
+        try:
+            await asyncio.wait_for(process.wait(), grace)
+        except asyncio.TimeoutError:
+            pass
+    # Children that ignored SIGTERM (or outlived the leader) are still in the group
+    signal_process_group(process, SIGKILL)
+    await process.wait()
+
+
+async def run_process(command, timeout: float, shell: bool = False,
+                      output_budget: int | None = None, spill_dir=None) -> ProcessResult:
+    """
+    Run a command to completion without blocking the event loop, killing its group on timeout.
+
+    Each of stdout and stderr keeps at most output_budget bytes in memory (head and tail);
+    past that, the whole stream is written to a spill file in spill_dir.
+    """
+    process = await start_process(command, shell=shell, stdin=asyncio.subprocess.DEVNULL)
+    stdout = OutputCapture(output_budget, spill_dir, "stdout")
+    stderr = OutputCapture(output_budget, spill_dir, "stderr")
+    try:
+        await asyncio.wait_for(asyncio.gather(
+            capture_stream(process.stdout, stdout),
+            capture_stream(process.stderr, stderr),
+            process.wait(),
+        ), timeout)
+    except asyncio.TimeoutError:
+        await terminate_process_group(process)
+        # Whatever it printed before being killed, and its spill files, are kept
+        return ProcessResult.captured(process.returncode, stdout, stderr, timed_out=True)
+    except asyncio.CancelledError:
+        # The tool call was cancelled: nothing will read the output, so don't wait for a grace period
+        signal_process_group(process, SIGKILL)
+        raise
+    finally:
+        stdout.close()
+        stderr.close()
+    return ProcessResult.captured(process.returncode, stdout, stderr)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tool registry for the Screenpipe MCP server
+Maps each tool name to its definition, its group and the handler serving it. Handlers are named
+"module:function" and imported on their first call, so groups that are never used never load
+their dependencies; calls are one dict lookup instead of an if/elif chain.
+"""
+
+import importlib
+import platform
+
+import mcp.types as types
+
+from screenpipe_client import tool_timeout
+
+CURRENT_OS = platform.system()
+
+# platform.system() values as shown to users
+PLATFORM_NAMES = {"Darwin": "MacOS", "Linux": "Linux", "Windows": "Windows"}
+
+
+class ToolSpec:
+    """One tool: its MCP definition, the group that enables it and its lazily imported handler"""
+
+    def __init__(self, name: str, group: str, handler: str, description: str, input_schema: dict,
+                 platforms: tuple[str, ...] = ()):
+        self.name = name
+        self.group = group
+        self.handler = handler
+        self.description = description
+        self.input_schema = input_schema
+        # platform.system() values the tool works on; empty means every platform
+        self.platforms = platforms
+
+    @property
+    def available(self) -> bool:
+        return not self.platforms or CURRENT_OS in self.platforms
+
+    def definition(self) -> types.Tool:
+        return types.Tool(name=self.name, description=self.description, inputSchema=self.input_schema)
+
+
+class ToolContext:
+    """Server state handed to every tool handler along with the tool name and arguments"""
+
+    def __init__(self, args, api: str, data_path, logs_path, log_writer, metrics, inflight, search_cache=None,
+                 timeouts=None):
+        self.args = args
+        self.api = api
+        self.data_path = data_path
+        self.logs_path = logs_path
+        self.log_writer = log_writer
+        self.metrics = metrics
+        self.inflight = inflight
+        self.search_cache = search_cache
+        # Per-tool upstream timeout overrides in seconds (--tool-timeout)
+        self.timeouts = timeouts or {}
+        # Opened by the background tasks once the server is up; None means query upstream
+        self.frame_index = None
+        self.rollup_store = None
+        # Background job table, created by the terminal tools on first use
+        self.jobs = None
+        # Persistent shell sessions for execute-terminal-command, created on first use
+        self.shells = None
+
+    def log(self, message):
+        """Log to the MCP log file (never blocks; the writer thread does the I/O)"""
+        self.log_writer.write(message)
+
+    def tool_timeout(self, name: str) -> float:
+        """Timeout in seconds for the upstream requests a tool makes"""
+        return tool_timeout(name, self.timeouts)
+
+
+def load(target: str):
+    """Import "module:function" and return the function"""
+    module, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+class ToolRegistry:
+    """The tools of the enabled groups, dispatched by name"""
+
+    def __init__(self, specs: list[ToolSpec], groups):
+        self.groups = set(groups)
+        self.specs = {spec.name: spec for spec in specs}
+        self.tools = {spec.name: spec for spec in specs if spec.group in self.groups}
+        self._handlers = {}
+        self._definitions = None
+
+    def definitions(self) -> list[types.Tool]:
+        """MCP definitions of the enabled tools available on this platform (built once)"""
+        if self._definitions is None:
+            self._definitions = [spec.definition() for spec in self.tools.values() if spec.available]
+        return self._definitions
+
+    def handler(self, name: str):
+        """The handler for an enabled tool, imported on first use"""
+        handler = self._handlers.get(name)
+        if handler is None:
+            handler = self._handlers[name] = load(self.tools[name].handler)
+        return handler
+
+    async def call(self, context: ToolContext, name: str, arguments: dict | None):
+        spec = self.tools.get(name)
+        if spec is None:
+            if name in self.specs:
+                raise ValueError(f"tool '{name}' is not enabled; start the server with --tool-groups including '{self.specs[name].group}'")
+            raise ValueError(f"unknown tool: {name}")
+        if not spec.available:
+            return [types.TextContent(
+                type="text",
+                text=f"the '{name}' tool is only available on {', '.join(PLATFORM_NAMES.get(p, p) for p in spec.platforms)}. current platform: {CURRENT_OS}"
+            )]
+        return await self.handler(name)(context, name, arguments or {})
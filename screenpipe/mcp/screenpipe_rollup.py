@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Persistent hourly rollups of Screenpipe activity
+Stores hour x app x content type -> frame count, first/last seen and screen time for closed hours, so productivity
+and daily-summary queries read O(hours) pre-aggregated rows instead of re-scanning raw frames
+"""
+
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from screenpipe_defaults import DEFAULT_IDLE_CAP_SECONDS, DEFAULT_ROLLUP_BACKFILL_HOURS
+from screenpipe_frames import FrameBatchBuilder, rollup_rows
+from screenpipe_index import format_utc, to_utc
+
+ROLLUP_FILENAME = "screenpipe_rollup.db"
+
+# An hour is only rolled up once it has been closed this long, so late OCR writes land first
+ROLLUP_GRACE = timedelta(minutes=5)
+
+# Bump when the table layout changes; rollups are derived data and are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+HOUR = timedelta(hours=1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hourly_rollup (
+    hour TEXT NOT NULL,
+    app_name TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    frames INTEGER NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    seconds REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, app_name, content_type)
+);
+CREATE TABLE IF NOT EXISTS rollup_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def floor_hour(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(dt: datetime) -> datetime:
+    floored = floor_hour(dt)
+    return floored if floored == dt else floored + HOUR
+
+
+def merge(rows: dict, other: dict):
+    """Merge rollup rows from other into rows"""
+    for key, (frames, first_seen, last_seen, seconds) in other.items():
+        row = rows.get(key)
+        if row is None:
+            rows[key] = [frames, first_seen, last_seen, seconds]
+        else:
+            row[0] += frames
+            row[1] = min(row[1], first_seen)
+            row[2] = max(row[2], last_seen)
+            row[3] += seconds
+
+
+class RollupStore:
+    """
+    Hourly rollup table, advanced one closed hour at a time by a background task.
+
+    Like FrameIndex, its async methods run SQLite work through asyncio.to_thread, and the cursor
+    is kept in memory so reading it never waits on a query.
+    """
+
+    # Screen time in stored rows is computed with this idle cap
+    idle_cap_seconds = DEFAULT_IDLE_CAP_SECONDS
+
+    def __init__(self, db_path: Path, backfill_hours: float = DEFAULT_ROLLUP_BACKFILL_HOURS):
+        self.db_path = Path(db_path)
+        self.backfill_hours = backfill_hours
+        # Frames left out of rollups because their timestamp could not be parsed
+        self.skipped_frames = 0
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS hourly_rollup; DROP TABLE IF EXISTS rollup_state;")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._rolled_from = self._get_state("rolled_from")
+        self._rolled_until = self._get_state("rolled_until")
+
+    def close(self):
+        self.conn.close()
+
+    def _get_state(self, key: str) -> datetime | None:
+        row = self.conn.execute("SELECT value FROM rollup_state WHERE key = ?", (key,)).fetchone()
+        return to_utc(row[0]) if row else None
+
+    def _set_state(self, key: str, value: datetime):
+        self.conn.execute(
+            "INSERT INTO rollup_state(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, format_utc(value)),
+        )
+
+    @property
+    def rolled_from(self) -> datetime | None:
+        return self._rolled_from
+
+    @property
+    def rolled_until(self) -> datetime | None:
+        """End of the last hour that has been rolled up (always on an hour boundary)"""
+        return self._rolled_until
+
+    async def advance(self, iter_pages, now: datetime | None = None) -> int:
+        """
+        Roll up every closed hour since the cursor. iter_pages(params) must yield /search result
+        pages for the given start_time/end_time. Returns the number of hours added.
+        """
+        now = now or datetime.now(timezone.utc)
+        last_closed = floor_hour(now - ROLLUP_GRACE)
+        hour = self.rolled_until or floor_hour(now - timedelta(hours=self.backfill_hours))
+
+        added = 0
+        while hour < last_closed:
+            builder = FrameBatchBuilder(keep_text=False)
+            params = {
+                "start_time": format_utc(hour),
+                "end_time": format_utc(hour + HOUR - ONE_MICROSECOND),
+            }
+            async for page in iter_pages(params):
+                builder.add_page(page)
+            rows, skipped = rollup_rows(builder.build(), self.idle_cap_seconds, format_utc(hour + HOUR)[:-1])
+            self.skipped_frames += skipped
+
+            await asyncio.to_thread(self._store_hour, hour, rows)
+            hour += HOUR
+            added += 1
+        return added
+
+    def _store_hour(self, hour: datetime, rows: dict):
+        """Replace one hour's rows and move the cursor past it"""
+        with self.conn:
+            self.conn.execute("DELETE FROM hourly_rollup WHERE hour = ?", (format_utc(hour),))
+            self.conn.executemany(
+                "INSERT INTO hourly_rollup(hour, app_name, content_type, frames, first_seen, last_seen, seconds) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*key, *row) for key, row in rows.items()],
+            )
+            if self._rolled_from is None:
+                self._set_state("rolled_from", hour)
+            self._set_state("rolled_until", hour + HOUR)
+        if self._rolled_from is None:
+            self._rolled_from = hour
+        self._rolled_until = hour + HOUR
+
+    def covered_range(self, start: datetime, end: datetime) -> tuple[datetime, datetime] | None:
+        """The whole hours inside [start, end] that have been rolled up, or None"""
+        rolled_from, rolled_until = self.rolled_from, self.rolled_until
+        if rolled_from is None or rolled_until is None:
+            return None
+        covered_start = max(ceil_hour(start), rolled_from)
+        covered_end = min(floor_hour(end + ONE_MICROSECOND), rolled_until)
+        if covered_start >= covered_end:
+            return None
+        return covered_start, covered_end
+
+    async def rows(self, start: datetime, end: datetime) -> dict:
+        """Stored rollup rows for the hours in [start, end), in the same shape rollup_rows() builds"""
+        return await asyncio.to_thread(self._rows, start, end)
+
+    def _rows(self, start: datetime, end: datetime) -> dict:
+        cursor = self.conn.execute(
+            "SELECT hour, app_name, content_type, frames, first_seen, last_seen, seconds FROM hourly_rollup "
+            "WHERE hour >= ? AND hour < ?",
+            (format_utc(start), format_utc(end)),
+        )
+        return {(hour, app, content_type): [frames, first_seen, last_seen, seconds]
+                for hour, app, content_type, frames, first_seen, last_seen, seconds in cursor}
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Time-weighted screen-time accounting for Screenpipe frames
+Attributes the interval up to the next frame of a time-sorted stream to the current frame,
+capped so idle periods are not counted. Vectorized over NumPy arrays; rollup_rows sums it per hour and app.
+"""
+
+import numpy as np
+
+NS_PER_SECOND = 1_000_000_000
+
+
+def frame_durations(timestamps: np.ndarray, idle_cap_seconds: float, range_end=None) -> np.ndarray:
+    """
+    Seconds attributed to each frame of a sorted datetime64[ns] array: the gap to the next frame,
+    capped at idle_cap_seconds. The last frame runs until range_end (also capped), or gets nothing.
+    """
+    if len(timestamps) == 0:
+        return np.zeros(0)
+    ticks = timestamps.astype("int64")
+    gaps = np.empty(len(ticks), dtype="int64")
+    gaps[:-1] = np.diff(ticks)
+    gaps[-1] = max(int(np.datetime64(range_end, "ns").astype("int64")) - ticks[-1], 0) if range_end is not None else 0
+    return np.minimum(gaps / NS_PER_SECOND, idle_cap_seconds)
+
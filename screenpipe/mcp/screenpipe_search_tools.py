@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Search tools of the Screenpipe MCP server (search-content, batch-search)
+Also the shared query helpers the analytics tools build on: /search through the local mirror,
+the result cache and in-flight coalescing, and page-by-page streaming of a time window.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+
+import mcp.types as types
+
+from screenpipe_client import get_client
+from screenpipe_coalesce import SEARCH_DEFAULTS, request_key
+from screenpipe_cursor import SearchCursor, query_fingerprint, result_timestamp
+from screenpipe_dedup import DEFAULT_DEDUP_WINDOW_MINUTES, CollapsedResult, collapse_near_duplicates
+from screenpipe_index import INDEX_FILENAME, FrameIndex, format_utc, iter_upstream_pages, to_utc
+from screenpipe_tools import MAX_BATCH_QUERIES
+
+# Page size used when a tool streams every frame in a time window
+EXPORT_PAGE_SIZE = 1000
+
+# search-content arguments handled by this server rather than sent to /search
+SEARCH_LOCAL_ARGS = {"dedup", "dedup_window_minutes", "cursor"}
+
+async def search_frames(context, name, params):
+    """Run a /search query, answering from the local mirror wherever it is synced"""
+    client = get_client()
+    if context.frame_index is None:
+        response = await client.get(
+            f"{context.api}/search",
+            params=params,
+            timeout=context.tool_timeout(name)
+        )
+        response.raise_for_status()
+        return response.json().get("data", [])
+
+    results, source = await context.frame_index.query(client, context.api, params, timeout=context.tool_timeout(name))
+    context.log(f"{name}: {len(results)} results from {source}")
+    return results
+
+async def cached_search(context, name, params):
+    """search_frames behind the result cache, with concurrent identical queries coalesced"""
+    key = request_key(name, params, SEARCH_DEFAULTS)
+    if context.search_cache is not None:
+        results = context.search_cache.get(key)
+        if results is not None:
+            return results
+
+    results = await context.inflight.do(key, lambda: search_frames(context, name, params))
+    if context.search_cache is not None:
+        context.search_cache.put(key, results, ttl=context.search_cache.ttl_for(params.get("end_time")))
+    return results
+
+def describe_error(error):
+    """Short description of a failed upstream query ("HTTP 500" rather than httpx's full message)"""
+    response = getattr(error, "response", None)
+    return f"HTTP {response.status_code}" if response is not None else (str(error) or type(error).__name__)
+
+async def search_since(context, name, params, cursor):
+    """
+    Frames matching params that are newer than cursor. Returns the oldest `limit` of them
+    (newest first, like /search) so successive polls never skip frames, and how many remain.
+    """
+    limit = max(int(params.get("limit", 10)), 1)
+    since = {k: v for k, v in params.items() if k not in ("limit", "offset")}
+    start = to_utc(since.get("start_time"))
+    if start is None or start < to_utc(cursor.timestamp):
+        since["start_time"] = cursor.timestamp
+
+    # Pages arrive newest first, so the last `limit` newer frames seen are the oldest ones
+    oldest = deque(maxlen=limit)
+    newer = 0
+    async for page in iter_frame_pages(context, name, since):
+        for result in page:
+            if cursor.is_newer(result):
+                oldest.append(result)
+                newer += 1
+    results = newest_first(list(oldest), key=lambda result: result_timestamp(result) or "")
+    return results, newer - len(results)
+
+async def scan_each_app(context, name, apps, params, on_page):
+    """
+    Stream every page of a /search per app concurrently until each app's window is exhausted,
+    calling on_page(app, page) as they arrive; returns {app: error} for apps whose scan failed
+    (their pages up to the failure have already been passed on).
+    """
+    semaphore = asyncio.Semaphore(max(context.args.search_concurrency, 1))
+
+    async def scan_app(app):
+        async with semaphore:
+            async for page in iter_frame_pages(context, name, {**params, "app_name": app}):
+                on_page(app, page)
+
+    outcomes = await asyncio.gather(*(scan_app(app) for app in apps), return_exceptions=True)
+
+    errors = {}
+    for app, outcome in zip(apps, outcomes):
+        if isinstance(outcome, Exception):
+            errors[app] = describe_error(outcome)
+            context.log(f"{name}: search for {app} failed: {errors[app]}")
+    return errors
+
+def newest_first(items, key):
+    """Return items ordered newest first, skipping the sort when they already are"""
+    if any(key(a) < key(b) for a, b in zip(items, items[1:])):
+        return sorted(items, key=key, reverse=True)
+    return items
+
+def format_search_results(results, dedup=True, dedup_window_minutes=DEFAULT_DEDUP_WINDOW_MINUTES):
+    """Render /search results as text blocks, one per result (or group of collapsed near-duplicates)"""
+    # Fold repeated captures of the same screen into one entry
+    if dedup:
+        entries = collapse_near_duplicates(results, window_minutes=dedup_window_minutes)
+    else:
+        entries = [CollapsedResult(result, None, None, None) for result in results]
+
+    # Format each result based on content type
+    formatted_results = []
+    for entry in entries:
+        result = entry.result
+        if "content" not in result:
+            continue
+
+        content = result["content"]
+        repeat_note = ""
+        if entry.count > 1:
+            span = f" between {format_utc(entry.first_seen)} and {format_utc(entry.last_seen)}" if entry.first_seen else ""
+            repeat_note = f"Repeated: {entry.count}x{span}\n"
+
+        if result.get("type") == "OCR":
+            text = (
+                f"OCR Text: {content.get('text', 'N/A')}\n"
+                f"App: {content.get('app_name', 'N/A')}\n"
+                f"Window: {content.get('window_name', 'N/A')}\n"
+                f"Time: {content.get('timestamp', 'N/A')}\n"
+                f"{repeat_note}"
+                "---\n"
+            )
+        elif result.get("type") == "Audio":
+            text = (
+                f"Audio Transcription: {content.get('transcription', 'N/A')}\n"
+                f"Device: {content.get('device_name', 'N/A')}\n"
+                f"Time: {content.get('timestamp', 'N/A')}\n"
+                "---\n"
+            )
+        elif result.get("type") == "UI":
+            text = (
+                f"UI Text: {content.get('text', 'N/A')}\n"
+                f"App: {content.get('app_name', 'N/A')}\n"
+                f"Window: {content.get('window_name', 'N/A')}\n"
+                f"Time: {content.get('timestamp', 'N/A')}\n"
+                f"{repeat_note}"
+                "---\n"
+            )
+        else:
+            continue
+
+        formatted_results.append(text)
+    return formatted_results
+
+async def iter_frame_pages(context, name, params, page_size=EXPORT_PAGE_SIZE):
+    """Stream every /search result for a query page by page, from the local mirror where synced"""
+    client = get_client()
+    if context.frame_index is None:
+        pages = iter_upstream_pages(client, context.api, params, page_size, context.tool_timeout(name))
+    else:
+        pages = context.frame_index.iter_pages(client, context.api, params, page_size, context.tool_timeout(name))
+    async for page in pages:
+        yield page
+
+async def sync_index_forever(context):
+    """Open the local mirror and keep it current with the screenpipe API"""
+    context.frame_index = FrameIndex(
+        context.data_path / INDEX_FILENAME,
+        backfill_hours=context.args.index_backfill_hours,
+        retention_hours=context.args.index_retention_hours,
+    )
+    while True:
+        try:
+            added = await context.frame_index.sync(get_client(), context.api, timeout=context.tool_timeout("index-sync"))
+            if added:
+                context.log(f"Index sync added {added} frames")
+        except Exception as e:
+            context.log(f"Index sync error: {str(e)}")
+        await asyncio.sleep(context.args.index_sync_interval)
+
+async def search_content(context, name, arguments):
+    try:
+        dedup = arguments.get("dedup", True)
+        dedup_window_minutes = arguments.get("dedup_window_minutes", DEFAULT_DEDUP_WINDOW_MINUTES)
+
+        # Build query parameters
+        params = {k: v for k, v in arguments.items() if v is not None and k not in SEARCH_LOCAL_ARGS}
+        fingerprint = query_fingerprint(params)
+
+        cursor = None
+        if arguments.get("cursor"):
+            cursor = SearchCursor.decode(arguments["cursor"])
+            if cursor.query != fingerprint:
+                raise ValueError("cursor belongs to a different query")
+
+        try:
+            if cursor:
+                results, pending = await search_since(context, name, params, cursor)
+            else:
+                results, pending = await cached_search(context, name, params), 0
+        except json.JSONDecodeError as json_error:
+            return [types.TextContent(
+                type="text",
+                text=f"failed to parse JSON response: {json_error}"
+            )]
+
+    except Exception as e:
+        context.log(f"Search error: {str(e)}")
+        return [types.TextContent(
+            type="text",
+            text=f"failed to search screenpipe: {str(e)}"
+        )]
+
+    # Format results
+    if not results:
+        return [types.TextContent(
+            type="text",
+            text=f"no new results since cursor\n\nCursor: {arguments['cursor']}" if cursor else "no results found"
+        )]
+
+    formatted_results = format_search_results(results, dedup, dedup_window_minutes)
+
+    # Pass this back as `cursor` to get only frames newer than these
+    next_cursor = SearchCursor.after(results, fingerprint, previous=cursor)
+    footer = f"\n\nCursor: {next_cursor.encode()}" if next_cursor else ""
+    if pending:
+        footer += f"\n{pending} newer results remain; call again with this cursor"
+    return [types.TextContent(
+        type="text",
+        text="Search Results:\n\n" + "\n".join(formatted_results) + footer
+    )]
+
+async def batch_search(context, name, arguments):
+    queries = arguments.get("queries") or []
+    if not queries or len(queries) > MAX_BATCH_QUERIES:
+        return [types.TextContent(
+            type="text",
+            text=f"failed to run batch search: expected 1 to {MAX_BATCH_QUERIES} queries, got {len(queries)}"
+        )]
+
+    # One limit shared by every query in the batch
+    concurrency = max(context.args.search_concurrency, 1)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_query(query):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                if not isinstance(query, dict):
+                    raise ValueError("query must be an object")
+                params = {k: v for k, v in query.items()
+                          if v is not None and k not in SEARCH_LOCAL_ARGS and k != "label"}
+                results = await cached_search(context, "search-content", params)
+                return results, None, time.perf_counter() - started
+            except Exception as e:
+                return None, e, time.perf_counter() - started
+
+    batch_started = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_query(query) for query in queries))
+    batch_seconds = time.perf_counter() - batch_started
+
+    sections = []
+    failed = 0
+    for i, (query, (results, error, seconds)) in enumerate(zip(queries, outcomes), 1):
+        query = query if isinstance(query, dict) else {}
+        label = query.get("label") or query.get("q") or f"query {i}"
+        if error is not None:
+            failed += 1
+            context.log(f"Batch search error for '{label}': {str(error)}")
+            sections.append(f"## {i}. {label} ({seconds * 1000:.0f} ms)\nfailed to search screenpipe: {describe_error(error)}\n")
+            continue
+        if not results:
+            sections.append(f"## {i}. {label} ({seconds * 1000:.0f} ms)\nno results found\n")
+            continue
+        formatted_results = format_search_results(
+            results,
+            query.get("dedup", True),
+            query.get("dedup_window_minutes", DEFAULT_DEDUP_WINDOW_MINUTES)
+        )
+        sections.append(
+            f"## {i}. {label} ({seconds * 1000:.0f} ms, {len(formatted_results)} results)\n\n"
+            + "\n".join(formatted_results)
+        )
+
+    summary = (
+        f"Batch Search: {len(queries)} queries in {batch_seconds * 1000:.0f} ms"
+        f" ({failed} failed, up to {concurrency} at a time)"
+    )
+    return [types.TextContent(
+        type="text",
+        text=summary + "\n\n" + "\n".join(sections)
+    )]
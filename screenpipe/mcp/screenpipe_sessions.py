@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Gap-based sessionization of Screenpipe activity
+Groups a time-sorted frame batch into work sessions with vectorized NumPy passes, splitting
+whenever the idle gap between consecutive frames exceeds a threshold
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import numpy as np
+
+from screenpipe_defaults import DEFAULT_IDLE_GAP_MINUTES
+
+# Most distinct window titles kept per session (the rest are only counted)
+MAX_WINDOW_TITLES = 5
+
+TERMINAL_APPS = {"Terminal", "iTerm", "iTerm2", "Warp", "Alacritty", "kitty"}
+JETBRAINS_APPS = {"IntelliJ", "IntelliJ IDEA", "PyCharm", "WebStorm", "GoLand", "CLion", "Rider"}
+EDITOR_SUFFIXES = {"Visual Studio Code", "Code", "Cursor", "Xcode"}
+
+TITLE_SEPARATOR = re.compile(r"\s+[—–-]\s+")
+PATH_PATTERN = re.compile(r"(?:~|/)[\w.\-/]*[\w.\-]")
+
+
+@lru_cache(maxsize=4096)
+def detect_project(app_name: str | None, window_name: str | None) -> str | None:
+    """Best-effort project name from an editor or terminal window title (cached: titles repeat heavily)"""
+    if not window_name:
+        return None
+
+    if app_name in TERMINAL_APPS:
+        # e.g. "user@host: ~/Local_Projects/Strategy_agents" or "~/code/app — zsh — 80x24"
+        match = PATH_PATTERN.search(window_name)
+        if match:
+            component = match.group(0).rstrip("/").rsplit("/", 1)[-1]
+            return component if component not in ("", "~") else None
+        return None
+
+    parts = [part.strip() for part in TITLE_SEPARATOR.split(window_name) if part.strip()]
+    if parts and parts[-1] in EDITOR_SUFFIXES:
+        parts = parts[:-1]
+    if len(parts) < 2:
+        return None
+
+    # JetBrains titles lead with the project ("project – file.py"); VS Code and Xcode end with it
+    if app_name in JETBRAINS_APPS:
+        return parts[0]
+    return parts[-1]
+
+
+@dataclass
+class Session:
+    """One contiguous stretch of activity"""
+    start: datetime
+    end: datetime
+    frames: int = 0
+    apps: Counter = field(default_factory=Counter)
+    window_titles: Counter = field(default_factory=Counter)
+    projects: Counter = field(default_factory=Counter)
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end - self.start
+
+    @property
+    def dominant_app(self) -> str | None:
+        return self.apps.most_common(1)[0][0] if self.apps else None
+
+    @property
+    def project(self) -> str | None:
+        return self.projects.most_common(1)[0][0] if self.projects else None
+
+    def top_windows(self, n: int = 3) -> list[str]:
+        return [title for title, _ in self.window_titles.most_common(n)]
+
+
+def to_datetime(value: np.datetime64) -> datetime:
+    return value.astype("datetime64[us]").item().replace(tzinfo=timezone.utc)
+
+
+def sessionize_batch(batch, idle_gap: timedelta = timedelta(minutes=DEFAULT_IDLE_GAP_MINUTES)) -> list[Session]:
+    """
+    Group a FrameBatch sorted oldest first with no NaT timestamps into sessions; a new session
+    starts whenever the gap to the previous frame exceeds idle_gap.
+
+    Session boundaries come from one np.diff over the timestamps; per-session app, window and
+    project counts are bincounts over the interned codes, so Python only loops per session.
+    """
+    if len(batch) == 0:
+        return []
+    gaps = np.diff(batch.timestamps.astype("int64"))
+    breaks = np.flatnonzero(gaps > int(idle_gap / timedelta(microseconds=1)) * 1000) + 1
+    starts = np.r_[0, breaks]
+    ends = np.r_[breaks, len(batch)]
+
+    sessions = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        session = Session(start=to_datetime(batch.timestamps[start]), end=to_datetime(batch.timestamps[end - 1]))
+        session.frames = end - start
+        apps = batch.apps[start:end]
+        windows = batch.windows[start:end]
+
+        app_counts = np.bincount(apps)
+        for code in np.flatnonzero(app_counts).tolist():
+            if batch.app_names[code]:
+                session.apps[batch.app_names[code]] = int(app_counts[code])
+
+        # Only the first MAX_WINDOW_TITLES distinct titles (in time order) are kept
+        codes, first_index, counts = np.unique(windows, return_index=True, return_counts=True)
+        named = [(first, code, count) for code, first, count in zip(codes.tolist(), first_index.tolist(), counts.tolist())
+                 if batch.window_names[code]]
+        for _, code, count in sorted(named)[:MAX_WINDOW_TITLES]:
+            session.window_titles[batch.window_names[code]] = count
+
+        # Projects are detected once per distinct (app, window) pair
+        pairs, pair_counts = np.unique(apps.astype(np.int64) * len(batch.window_names) + windows, return_counts=True)
+        for pair, count in zip(pairs.tolist(), pair_counts.tolist()):
+            app_code, window_code = divmod(pair, len(batch.window_names))
+            project = detect_project(batch.app_names[app_code], batch.window_names[window_code])
+            if project:
+                session.projects[project] += count
+        sessions.append(session)
+    return sessions
+
+
+def format_duration(duration: timedelta) -> str:
+    minutes = int(duration.total_seconds() // 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m"
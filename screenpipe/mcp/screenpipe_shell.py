@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Persistent shells for the Screenpipe MCP server's terminal tools
+A session is one long-lived /bin/sh driven through its stdin. Each command is followed by a
+unique sentinel on stdout and stderr, so its output and exit status are framed without
+spawning a process per command, and `cd`, variables and exports carry over between calls.
+"""
+
+import asyncio
+import shlex
+import uuid
+
+from screenpipe_capture import READ_CHUNK, OutputCapture
+from screenpipe_defaults import DEFAULT_MAX_SHELL_SESSIONS
+from screenpipe_process import (
+    SIGKILL,
+    ProcessResult,
+    signal_process_group,
+    start_process,
+    terminate_process_group,
+)
+
+# Shell every session runs; the same one `shell=True` subprocesses use
+SESSION_SHELL = "/bin/sh"
+
+
+class SessionLimitError(Exception):
+    """Raised when a new session is needed but every session slot is busy"""
+
+
+class SessionClosed(Exception):
+    """The shell exited (e.g. the command ran `exit`) before printing the sentinel"""
+
+
+async def read_until(stream: asyncio.StreamReader, sentinel: bytes, capture: OutputCapture, line: bool = False) -> bytes:
+    """Copy stream into capture up to sentinel; with line, returns the rest of the sentinel's line"""
+    pending = bytearray()
+    # The sentinel may straddle two reads, so this many trailing bytes wait for the next one
+    keep = len(sentinel) - 1
+    while True:
+        found = pending.find(sentinel)
+        if found >= 0:
+            capture.write(bytes(pending[:found]))
+            rest = pending[found + len(sentinel):]
+            while line and b"\n" not in rest:
+                chunk = await stream.read(READ_CHUNK)
+                if not chunk:
+                    raise SessionClosed()
+                rest += chunk
+            return bytes(rest.split(b"\n", 1)[0]) if line else b""
+        if len(pending) > keep:
+            capture.write(bytes(pending[:-keep]))
+            del pending[:-keep]
+        try:
+            chunk = await stream.read(READ_CHUNK)
+        except asyncio.CancelledError:
+            # Timed out: the held-back bytes are output too
+            capture.write(bytes(pending))
+            raise
+        if not chunk:
+            capture.write(bytes(pending))
+            raise SessionClosed()
+        pending += chunk
+
+
+class ShellSession:
+    """One named, long-lived shell; commands sent to it run one at a time"""
+
+    def __init__(self, name: str, shell: str = SESSION_SHELL):
+        self.name = name
+        self.shell = shell
+        self.process = None
+        self.closed = False
+        self.commands = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    async def _start(self):
+        self.process = await start_process([self.shell], stdin=asyncio.subprocess.PIPE)
+        # Ctrl-C goes to the session's whole process group: the running command dies, the shell
+        # carries on (a trapped signal is reset to its default in the commands it starts)
+        self.process.stdin.write(b"trap : INT\n")
+
+    def send_signal(self, sig: int) -> bool:
+        """Signal the command running in this session (the shell's process group); False when idle"""
+        return self.busy and self.process is not None and signal_process_group(self.process, sig)
+
+    def _script(self, command: str, sentinel: str) -> bytes:
+        # `command eval` keeps a syntax error from exiting the shell; stdin is /dev/null so the
+        # command can't swallow the lines that follow it
+        return (
+            f"command eval {shlex.quote(command)} </dev/null\n"
+            f"__screenpipe_rc=$?\n"
+            f"printf '%s %d\\n' {sentinel} \"$__screenpipe_rc\"\n"
+            f"printf '%s\\n' {sentinel} >&2\n"
+        ).encode()
+
+    async def run(self, command: str, timeout: float, output_budget: int | None = None, spill_dir=None) -> ProcessResult:
+        """
+        Run command in this session; on timeout the session is killed and a new one starts next time.
+
+        Output is captured like run_process's: output_budget bytes per stream, the rest spilled.
+        """
+        async with self._lock:
+            if self.closed:
+                raise SessionClosed()
+            if self.process is None or self.process.returncode is not None:
+                await self._start()
+            self.commands += 1
+            sentinel = f"__screenpipe_{uuid.uuid4().hex}__".encode()
+            stdout = OutputCapture(output_budget, spill_dir, "stdout")
+            stderr = OutputCapture(output_budget, spill_dir, "stderr")
+            reads = []
+            try:
+                self.process.stdin.write(self._script(command, sentinel.decode()))
+                await self.process.stdin.drain()
+                reads = [
+                    asyncio.ensure_future(read_until(self.process.stdout, sentinel, stdout, line=True)),
+                    asyncio.ensure_future(read_until(self.process.stderr, sentinel, stderr)),
+                ]
+                _, pending = await asyncio.wait(reads, timeout=timeout)
+            except ConnectionError:
+                # The shell died between commands; the pool starts a new one
+                self.closed = True
+                await terminate_process_group(self.process)
+                raise SessionClosed()
+            except asyncio.CancelledError:
+                self.closed = True
+                signal_process_group(self.process, SIGKILL)
+                raise
+            finally:
+                for read in reads:
+                    read.cancel()
+                stdout.close()
+                stderr.close()
+
+            if pending:
+                self.closed = True
+                await terminate_process_group(self.process)
+                return ProcessResult.captured(self.process.returncode, stdout, stderr, timed_out=True)
+
+            results = [read.exception() or read.result() for read in reads]
+            for result in results:
+                if isinstance(result, BaseException) and not isinstance(result, SessionClosed):
+                    raise result
+            if isinstance(results[0], SessionClosed):
+                # The command ended the shell itself (`exit`, `exec`); its exit status is the command's
+                self.closed = True
+                await terminate_process_group(self.process)
+                returncode = self.process.returncode
+            else:
+                returncode = int(results[0].strip() or 0)
+                if isinstance(results[1], SessionClosed):
+                    # stderr was closed under the shell; don't reuse it
+                    self.closed = True
+                    await terminate_process_group(self.process)
+
+            return ProcessResult.captured(returncode, stdout, stderr)
+
+    async def close(self):
+        """End the shell and everything it left running"""
+        self.closed = True
+        if self.process and self.process.returncode is None:
+            signal_process_group(self.process, SIGKILL)
+            await self.process.wait()
+
+
+class ShellPool:
+    """Named shell sessions, started on first use; the least recently used idle one makes room"""
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SHELL_SESSIONS, shell: str = SESSION_SHELL):
+        self.max_sessions = max(max_sessions, 1)
+        self.shell = shell
+        # Ordered from least to most recently used
+        self.sessions: dict[str, ShellSession] = {}
+
+    def get(self, name: str):
+        """The named session, or None if it isn't open"""
+        session = self.sessions.get(name)
+        return session if session and not session.closed else None
+
+    def _make_room(self):
+        """Remove and return the least recently used idle session once the pool is full"""
+        if len(self.sessions) < self.max_sessions:
+            return None
+        for session in self.sessions.values():
+            if not session.busy:
+                del self.sessions[session.name]
+                return session
+        raise SessionLimitError(
+            f"all {self.max_sessions} shell sessions are busy; wait for one or reuse a session name"
+        )
+
+    async def run(self, name: str, command: str, timeout: float,
+                  output_budget: int | None = None, spill_dir=None) -> ProcessResult:
+        """Run command in the named session, starting (or restarting) the session as needed"""
+        session = self.sessions.pop(name, None)
+        evicted = None
+        if session is None or session.closed:
+            evicted = self._make_room()
+            session = ShellSession(name, self.shell)
+        self.sessions[name] = session
+        if evicted:
+            await evicted.close()
+        try:
+            return await session.run(command, timeout, output_budget, spill_dir)
+        except SessionClosed:
+            # Timed out or exited while this call was queued behind another; start afresh
+            return await self.run(name, command, timeout, output_budget, spill_dir)
+
+    async def close(self):
+        """End every session (server shutdown)"""
+        sessions, self.sessions = list(self.sessions.values()), {}
+        await asyncio.gather(*(session.close() for session in sessions), return_exceptions=True)
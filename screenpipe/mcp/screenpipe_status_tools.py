@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Status tools of the Screenpipe MCP server (server-metrics, test-connection, get-health)
+"""
+
+import asyncio
+import json
+
+import httpx
+import mcp.types as types
+
+from screenpipe_client import get_client
+from screenpipe_metrics import METRICS_FILENAME
+
+async def server_metrics(context, name, arguments):
+    report = context.metrics.format_report()
+    report += f"\n\nCoalesced calls: {context.inflight.shared} shared an in-flight query ({context.inflight.executed} executed)"
+    if context.search_cache is not None:
+        cache = context.search_cache.stats()
+        report += (
+            f"\nSearch cache: {cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate']:.1%} hit rate), "
+            f"{cache['entries']} entries, {cache['bytes'] / 1024 / 1024:.1f}/{cache['max_bytes'] / 1024 / 1024:.0f} MB, "
+            f"{cache['evictions']} evicted, {cache['expirations']} expired"
+        )
+    if context.frame_index is not None:
+        index = await asyncio.to_thread(context.frame_index.stats)
+        retention = f"keeping {index['retention_hours']:g}h" if index["retention_hours"] else "keeping everything"
+        report += (
+            f"\nLocal index: {index['frames']} frames, {index['bytes'] / 1024 / 1024:.1f} MB, "
+            f"synced {index['synced_from'] or 'never'} → {index['synced_until'] or 'never'}, "
+            f"{retention} ({index['pruned']} pruned)"
+        )
+    if arguments.get("dump", False):
+        report += f"\n\nMetrics written to {context.metrics.dump(context.logs_path / METRICS_FILENAME)}"
+    if arguments.get("reset", False):
+        context.metrics.reset()
+        report += "\n\nCounters reset"
+    return [types.TextContent(
+        type="text",
+        text=report
+    )]
+
+async def test_connection(context, name, arguments):
+    try:
+        response = await get_client().get(
+            f"{context.api}/health",
+            timeout=context.tool_timeout(name)
+        )
+
+        if response.status_code == 200:
+            return [types.TextContent(
+                type="text",
+                text="✅ Successfully connected to Screenpipe API"
+            )]
+        else:
+            context.log(f"Screenpipe returned status {response.status_code}")
+            return [types.TextContent(
+                type="text",
+                text=f"⚠️ Screenpipe API returned status {response.status_code}"
+            )]
+    except httpx.ConnectError:
+        context.log("Failed to connect to Screenpipe - connection refused")
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Cannot connect to Screenpipe - is it running at {context.api}?"
+        )]
+    except httpx.TimeoutException:
+        context.log("Screenpipe connection timed out")
+        return [types.TextContent(
+            type="text",
+            text="❌ Screenpipe connection timed out"
+        )]
+    except Exception as e:
+        context.log(f"Unexpected error connecting to Screenpipe: {e}")
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Failed to connect to Screenpipe: {str(e)}"
+        )]
+
+async def get_health(context, name, arguments):
+    try:
+        response = await get_client().get(
+            f"{context.api}/health",
+            timeout=context.tool_timeout(name)
+        )
+
+        if response.status_code == 200:
+            health_info = json.dumps(response.json(), indent=2)
+            return [types.TextContent(
+                type="text",
+                text=f"📊 Screenpipe Health Status:\n\n```json\n{health_info}\n```"
+            )]
+        else:
+            return [types.TextContent(
+                type="text",
+                text=f"❌ Health check failed with status {response.status_code}"
+            )]
+    except Exception as e:
+        context.log(f"Health check error: {e}")
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Health check error: {str(e)}"
+        )]
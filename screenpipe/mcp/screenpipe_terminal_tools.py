@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Terminal tools of the Screenpipe MCP server
+execute-terminal-command, send-control-character, start-repl and the background job tools
+(start-job, job-output, job-status, job-cancel). Only enabled with the "terminal" tool group,
+since they run arbitrary commands on this machine.
+"""
+
+import platform
+import signal
+
+import mcp.types as types
+
+from screenpipe_defaults import DEFAULT_JOB_READ_BYTES
+from screenpipe_jobs import JobLimitError, JobManager
+from screenpipe_process import SIGCONT, SIGSTOP, run_process
+from screenpipe_shell import ShellPool, ShellSession
+
+IS_MACOS = platform.system() == "Darwin"
+
+# Directory under logs/ for the full output of commands that outgrew the output budget
+OUTPUT_SPILL_DIR = "terminal_output"
+
+# Control characters delivered as signals to a job's or shell session's process group
+CONTROL_SIGNALS = {
+    "C": ("interrupt", signal.SIGINT),
+    "Z": ("suspend", SIGSTOP),
+    "Q": ("resume", SIGCONT),
+}
+
+# Control characters that mean nothing without a terminal, and why
+UNSIGNALLED_CHARACTERS = {
+    "D": "jobs and shell session commands read from /dev/null, so they have already seen end of input",
+    "L": "command output is captured, not shown on a terminal screen",
+}
+
+# REPL commands by language name
+REPL_COMMANDS = {
+    "python": "python",
+    "python3": "python3",
+    "node": "node",
+    "nodejs": "node",
+    "ipython": "ipython",
+    "bash": "bash",
+    "zsh": "zsh"
+}
+
+async def execute_terminal_command(command, timeout=120, shells=None, session="default",
+                                   output_budget=None, spill_dir=None):
+    """
+    Execute a command in a persistent shell session (or, without shells, a new subprocess).
+
+    At most output_budget bytes per stream are kept; longer output is saved in full under spill_dir.
+    """
+    capture = {"output_budget": output_budget, "spill_dir": spill_dir}
+    try:
+        if shells is not None:
+            # No process start-up per command, and cd / exports carry over to the session's next command
+            result = await shells.run(session, command, timeout, **capture)
+            if result.timed_out:
+                return timeout_error(command, timeout, result)
+            return shell_result(result, command, f"shell session '{session}'")
+
+        if IS_MACOS:
+            # Use do shell script instead of Terminal.app - much more reliable
+            # Build command properly: pass command string directly to shell
+            escaped_command = command.replace('"', '\\"')
+            script = f'do shell script "{escaped_command}"'
+
+            result = await run_process(['osascript', '-e', script], timeout, **capture)
+            if result.timed_out:
+                return timeout_error(command, timeout, result)
+
+            if result.returncode == 0:
+                return {
+                    "success": True,
+                    "output": result.stdout.strip(),
+                    "method": "do shell script",
+                    "command_executed": command
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": result.stderr.strip(),
+                    "method": "do shell script",
+                    "command_attempted": command
+                }
+
+        else:
+            # For non-macOS systems, execute directly
+            result = await run_process(command, timeout, shell=True, **capture)
+            if result.timed_out:
+                return timeout_error(command, timeout, result)
+            return shell_result(result, command, "direct shell")
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Execution failed: {str(e)}",
+            "command_attempted": command,
+            "method": "exception_error"
+        }
+
+def shell_result(result, command, method):
+    return {
+        "success": result.returncode == 0,
+        "output": result.stdout.strip() if result.returncode == 0 else "",
+        "error": result.stderr.strip() if result.returncode != 0 else "",
+        "return_code": result.returncode,
+        "output_bytes": result.output_bytes,
+        "spill_files": list(result.spill_files),
+        "method": method,
+        "command_executed": command
+    }
+
+def timeout_error(command, timeout, result=None):
+    """The timeout response, with whatever output the command captured (and spilled) before it was killed"""
+    error = f"Command timed out after {timeout:g} seconds and was killed. Consider: 1) Breaking into smaller steps, 2) Running it as a background job with start-job and polling job-output"
+    partial = "\n".join(text for text in (result.stdout.strip(), result.stderr.strip()) if text) if result else ""
+    if partial:
+        error += f"\n\nOutput before it was killed:\n{partial}"
+    return {
+        "success": False,
+        "error": error,
+        "suggestion": "For long commands (builds, test runs), use start-job and poll job-output / job-status",
+        "output_bytes": result.output_bytes if result else 0,
+        "spill_files": list(result.spill_files) if result else [],
+        "command_attempted": command,
+        "method": "timeout_error"
+    }
+
+def control_target(context, job_id=None, session=None):
+    """(label, job or shell session) a control character goes to: the one named, else the only one running"""
+    if job_id:
+        try:
+            job = job_manager(context).get(job_id)
+        except KeyError:
+            raise LookupError(f"no such job: {job_id!r}")
+        return f"{job.id} (process group {job.pid})", job
+
+    if session:
+        shell = context.shells.get(session) if context.shells else None
+        if shell is None:
+            raise LookupError(f"no open shell session named {session!r}")
+        return f"shell session '{session}' (process group {shell.pid})", shell
+
+    running = []
+    if context.jobs:
+        running += [(f"{job.id} (process group {job.pid})", job) for job in context.jobs.running()]
+    if context.shells:
+        running += [(f"shell session '{shell.name}' (process group {shell.pid})", shell)
+                    for shell in context.shells.sessions.values() if shell.busy]
+    if len(running) == 1:
+        return running[0]
+    if not running:
+        raise LookupError("nothing to signal: no background job or shell session command is running")
+    raise LookupError(
+        f"{len(running)} jobs/sessions are running ({', '.join(label for label, _ in running)}); "
+        f"pass job_id or session to choose one"
+    )
+
+async def send_control_character(context, char, job_id=None, session=None):
+    """Deliver a control character as a signal to one tracked job's or shell session's process group"""
+    char = char.upper()
+    if char in UNSIGNALLED_CHARACTERS:
+        return {
+            "success": False,
+            "error": f"Ctrl-{char} has no effect here: {UNSIGNALLED_CHARACTERS[char]}"
+        }
+    if char not in CONTROL_SIGNALS:
+        return {
+            "success": False,
+            "error": f"Unsupported control character: {char}. Supported: {', '.join(CONTROL_SIGNALS)}"
+        }
+
+    action, sig = CONTROL_SIGNALS[char]
+    if sig is None:
+        return {
+            "success": False,
+            "error": f"Ctrl-{char} ({action}) is not supported on {platform.system()}"
+        }
+
+    try:
+        label, target = control_target(context, job_id, session)
+    except LookupError as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+    if char == "Z" and isinstance(target, ShellSession):
+        # Without job control the session's shell would wait on the stopped command until it timed out
+        return {
+            "success": False,
+            "error": "Ctrl-Z is not supported in shell sessions; interrupt with Ctrl-C, or run the command with start-job to suspend it"
+        }
+
+    if not target.send_signal(sig):
+        return {
+            "success": False,
+            "error": f"{label} is no longer running"
+        }
+    return {
+        "success": True,
+        "output": f"Sent Ctrl-{char} ({action}) to {label}",
+        "method": "process group signal"
+    }
+
+async def execute_command(context, name, arguments):
+    command = arguments.get("command", "")
+
+    if not command:
+        return [types.TextContent(
+            type="text",
+            text="No command provided"
+        )]
+
+    try:
+        timeout = float(arguments.get("timeout", 120))
+    except (TypeError, ValueError):
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Error: timeout must be a number of seconds, got {arguments.get('timeout')!r}"
+        )]
+
+    shells = None if context.args.no_shell_sessions else shell_pool(context)
+    session = arguments.get("session") or "default"
+
+    context.log(f"Executing terminal command: {command}")
+    result = await execute_terminal_command(
+        command,
+        timeout,
+        shells=shells,
+        session=session,
+        output_budget=context.args.output_budget_kb * 1024,
+        spill_dir=context.logs_path / OUTPUT_SPILL_DIR,
+    )
+
+    if result["success"]:
+        text = f"✅ {result['output']}"
+    else:
+        text = f"❌ Error: {result['error']}"
+
+    # Truncated streams name their spill file inline; a truncated stream that isn't shown still gets a pointer
+    for path in result.get("spill_files", []):
+        if path not in text:
+            text += f"\n\n[{result['output_bytes']} bytes of output in total; full output saved to {path}]"
+
+    return [types.TextContent(
+        type="text",
+        text=text
+    )]
+
+async def send_control(context, name, arguments):
+    character = arguments.get("character", "")
+
+    if not character:
+        return [types.TextContent(
+            type="text",
+            text="No control character specified"
+        )]
+
+    job_id = arguments.get("job_id")
+    session = arguments.get("session")
+
+    context.log(f"Sending control character: Ctrl-{character} (job: {job_id}, session: {session})")
+    result = await send_control_character(context, character, job_id=job_id, session=session)
+
+    if result["success"]:
+        return [types.TextContent(
+            type="text",
+            text=f"✅ {result['output']}"
+        )]
+    else:
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Error: {result['error']}"
+        )]
+
+async def start_repl(context, name, arguments):
+    language = arguments.get("language", "python")
+    command = REPL_COMMANDS.get(language, language)
+
+    context.log(f"Starting {language} REPL")
+    result = await execute_terminal_command(
+        command,
+        output_budget=context.args.output_budget_kb * 1024,
+        spill_dir=context.logs_path / OUTPUT_SPILL_DIR,
+    )
+
+    if result["success"]:
+        return [types.TextContent(
+            type="text",
+            text=f"✅ Started {language} REPL: {result['output']}"
+        )]
+    else:
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Failed to start {language} REPL: {result['error']}"
+        )]
+
+def shell_pool(context) -> ShellPool:
+    """The server's persistent shell sessions, created on first use"""
+    if context.shells is None:
+        context.shells = ShellPool(max_sessions=context.args.max_shell_sessions)
+    return context.shells
+
+def job_manager(context) -> JobManager:
+    """The server's job table, created on first use"""
+    if context.jobs is None:
+        context.jobs = JobManager(
+            max_jobs=context.args.max_jobs,
+            max_output_bytes=context.args.job_output_kb * 1024,
+        )
+    return context.jobs
+
+def unknown_job(job_id):
+    return [types.TextContent(
+        type="text",
+        text=f"❌ Error: no such job: {job_id!r} (finished jobs are forgotten after a while; see job-status)"
+    )]
+
+async def start_job(context, name, arguments):
+    command = arguments.get("command", "")
+
+    if not command:
+        return [types.TextContent(
+            type="text",
+            text="No command provided"
+        )]
+
+    timeout = arguments.get("timeout")
+    try:
+        timeout = float(timeout) if timeout is not None else None
+    except (TypeError, ValueError):
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Error: timeout must be a number of seconds, got {timeout!r}"
+        )]
+
+    context.log(f"Starting background job: {command}")
+    try:
+        job = await job_manager(context).start(command, cwd=arguments.get("cwd"), timeout=timeout)
+    except JobLimitError as e:
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Error: {e}"
+        )]
+    except OSError as e:
+        return [types.TextContent(
+            type="text",
+            text=f"❌ Error: failed to start job: {e}"
+        )]
+
+    return [types.TextContent(
+        type="text",
+        text=f"✅ Started {job.id} (pid {job.pid}): {command}\n"
+             f"Poll with job-output (job_id={job.id!r}, offset=0) and job-status; stop with job-cancel."
+    )]
+
+async def job_output(context, name, arguments):
+    job_id = arguments.get("job_id", "")
+    try:
+        job = job_manager(context).get(job_id)
+    except KeyError:
+        return unknown_job(job_id)
+
+    try:
+        offset = int(arguments.get("offset", 0))
+        max_bytes = max(int(arguments.get("max_bytes", DEFAULT_JOB_READ_BYTES)), 1)
+    except (TypeError, ValueError):
+        return [types.TextContent(
+            type="text",
+            text="❌ Error: offset and max_bytes must be integers"
+        )]
+
+    output = job.output
+    if offset < 0:
+        # Negative offsets count back from the end, for a quick look at the latest output
+        offset = max(output.total + offset, 0)
+    data, start = output.read(offset, max_bytes)
+    end = start + len(data)
+
+    header = f"{job.describe()}\nbytes {start}-{end} of {output.total}, next offset: {end}"
+    if start > offset:
+        header += f" ({start - offset} bytes before this were dropped from the job's output buffer)"
+    if end < output.total:
+        header += f" ({output.total - end} more bytes available)"
+
+    return [types.TextContent(
+        type="text",
+        text=f"{header}\n\n{data.decode('utf-8', errors='replace')}"
+    )]
+
+async def job_status(context, name, arguments):
+    jobs = job_manager(context)
+    job_id = arguments.get("job_id")
+
+    if job_id:
+        try:
+            return [types.TextContent(type="text", text=jobs.get(job_id).describe())]
+        except KeyError:
+            return unknown_job(job_id)
+
+    if not jobs.jobs:
+        return [types.TextContent(type="text", text="No background jobs")]
+
+    lines = [f"{len(jobs.running())}/{jobs.max_jobs} jobs running"]
+    lines.extend(job.describe() for job in jobs.jobs.values())
+    return [types.TextContent(type="text", text="\n".join(lines))]
+
+async def job_cancel(context, name, arguments):
+    job_id = arguments.get("job_id", "")
+    jobs = job_manager(context)
+    try:
+        running = jobs.get(job_id).running
+    except KeyError:
+        return unknown_job(job_id)
+
+    context.log(f"Cancelling background job: {job_id}")
+    job = await jobs.cancel(job_id)
+    if not running:
+        return [types.TextContent(
+            type="text",
+            text=f"{job.id} had already finished: {job.describe()}"
+        )]
+    return [types.TextContent(
+        type="text",
+        text=f"✅ Cancelled {job.describe()}"
+    )]
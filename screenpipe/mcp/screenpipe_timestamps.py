@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Bulk ISO-8601 timestamp parsing for Screenpipe result pages
+A whole page of timestamps is turned into one UTC datetime64[ns] array by NumPy's C datetime
+parser. Pages of plain 'Z' timestamps (what Screenpipe returns) take a single call; mixed pages
+have their zone suffixes found and stripped on the code-point matrix of the strings and offsets
+applied as one subtraction. Values that cannot be parsed become NaT and are counted, never
+silently dropped.
+"""
+
+import warnings
+
+import numpy as np
+
+EMPTY = np.empty(0, dtype="datetime64[ns]")
+
+ZULU = (ord("Z"), ord("z"))
+SIGNS = (ord("+"), ord("-"))
+COLON = ord(":")
+ZERO = ord("0")
+
+# Rows per retry when a page holds malformed values
+FALLBACK_CHUNK = 1024
+
+
+def parse_timestamps(values) -> tuple[np.ndarray, int]:
+    """
+    Parse ISO-8601 timestamps into UTC datetime64[ns].
+
+    Accepts a 'Z' suffix, a '+HH:MM'/'-HH:MM' offset or no zone (taken as UTC), with any
+    fractional-second precision. Returns the array, with NaT wherever a value is missing or
+    malformed, and the number of such values.
+    """
+    try:
+        # Fast path: every value is a string with a 'Z' suffix or no zone at all. NumPy warns
+        # (rather than fails) on other offsets, so a warning also sends the page down the full path.
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            parsed = np.array([value.removesuffix("Z") for value in values], dtype="datetime64[ns]")
+        if not caught:
+            return parsed, int(np.isnat(parsed).sum())
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return _parse_mixed(values)
+
+
+def _parse_mixed(values) -> tuple[np.ndarray, int]:
+    """parse_timestamps() for pages with offsets, padding, non-strings or malformed values"""
+    strings = np.array([value.strip() if isinstance(value, str) else "" for value in values], dtype=np.str_)
+    count = len(strings)
+    if count == 0:
+        return EMPTY.copy(), 0
+    if strings.dtype.itemsize == 0:
+        return np.full(count, np.datetime64("NaT", "ns")), count
+
+    # One row of UTF-32 code points per string; NUL padding marks the end of shorter strings
+    width = strings.dtype.itemsize // 4
+    codes = strings.view(np.uint32).reshape(count, width).copy()
+    lengths = np.char.str_len(strings)
+    rows = np.arange(count)
+
+    last = codes[rows, np.maximum(lengths - 1, 0)]
+    zulu = (lengths > 0) & np.isin(last, ZULU)
+
+    offset = np.zeros(count, dtype=bool)
+    offset_minutes = np.zeros(count, dtype=np.int64)
+    if width >= 6:
+        candidates = lengths >= 16  # at least "YYYY-MM-DDTHH" plus "+HH:MM"
+        sign = codes[rows, np.maximum(lengths - 6, 0)]
+        colon = codes[rows, np.maximum(lengths - 3, 0)]
+        offset = candidates & ~zulu & np.isin(sign, SIGNS) & (colon == COLON)
+        if offset.any():
+            digits = [codes[rows, np.maximum(lengths - back, 0)].astype(np.int64) - ZERO for back in (5, 4, 2, 1)]
+            hours = digits[0] * 10 + digits[1]
+            minutes = digits[2] * 10 + digits[3]
+            in_range = (hours >= 0) & (hours <= 23) & (minutes >= 0) & (minutes <= 59)
+            offset &= in_range
+            offset_minutes = np.where(offset, (hours * 60 + minutes) * np.where(sign == SIGNS[1], -1, 1), 0)
+
+    # Truncate the zone suffix in place by NUL-ing everything past the base timestamp
+    base_lengths = lengths - zulu - 6 * offset
+    codes[np.arange(width)[None, :] >= base_lengths[:, None]] = 0
+    bases = codes.view(strings.dtype).reshape(count)
+
+    parsed = _to_datetime64(bases)
+    if offset.any():
+        parsed = parsed - offset_minutes * np.timedelta64(1, "m")
+
+    # Empty strings parse to NaT too, so every missing or malformed value is counted here
+    return parsed, int(np.isnat(parsed).sum())
+
+
+def _to_datetime64(strings: np.ndarray) -> np.ndarray:
+    """
+    Convert zone-less timestamp strings, with NaT for the malformed ones. NumPy rejects a whole
+    array on the first bad value, so failing chunks are retried element by element.
+    """
+    try:
+        return strings.astype("datetime64[ns]")
+    except ValueError:
+        pass
+    parsed = np.empty(len(strings), dtype="datetime64[ns]")
+    for start in range(0, len(strings), FALLBACK_CHUNK):
+        chunk = strings[start:start + FALLBACK_CHUNK]
+        try:
+            parsed[start:start + len(chunk)] = chunk.astype("datetime64[ns]")
+            continue
+        except ValueError:
+            pass
+        for i, value in enumerate(chunk.tolist(), start):
+            try:
+                parsed[i] = np.datetime64(value, "ns")
+            except ValueError:
+                parsed[i] = np.datetime64("NaT")
+    return parsed
+
+
+def iso_strings(timestamps: np.ndarray) -> list[str]:
+    """Format datetime64 values the way format_utc() does ("YYYY-MM-DDTHH:MM:SS.ffffffZ")"""
+    return [f"{value}Z" for value in np.datetime_as_string(timestamps.astype("datetime64[us]"))]
+
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Catalog of the Screenpipe MCP server's tools
+Every tool's definition, group and handler in one place. Handlers live in one module per
+group and are only imported when a tool of that group is first called.
+"""
+
+from screenpipe_defaults import DEFAULT_DEDUP_WINDOW_MINUTES, DEFAULT_IDLE_CAP_SECONDS, DEFAULT_IDLE_GAP_MINUTES, DEFAULT_JOB_READ_BYTES
+from screenpipe_metrics import METRICS_FILENAME
+from screenpipe_registry import ToolSpec
+
+# Tool groups, selected with --tool-groups
+TOOL_GROUPS = {
+    "search": "search-content and batch-search over recorded content",
+    "analytics": "productivity analysis, coding sessions and daily summaries",
+    "status": "server metrics and Screenpipe connection/health checks",
+    "control": "mouse/keyboard control and opening applications or URLs",
+    "terminal": "shell commands, background jobs, control characters and REPLs on this machine",
+}
+
+# Running shell commands is opt-in
+DEFAULT_GROUPS = ["search", "analytics", "status", "control"]
+
+# Most queries a single batch-search call may carry
+MAX_BATCH_QUERIES = 20
+
+# Query parameters of search-content, also accepted per query by batch-search
+SEARCH_QUERY_PROPERTIES = {
+    "q": {
+        "type": "string",
+        "description": "Search query to find in recorded content",
+    },
+    "content_type": {
+        "type": "string",
+        "enum": ["all","ocr", "audio","ui"],
+        "description": "Type of content to search: 'ocr' for screen text, 'audio' for spoken words, 'ui' for UI elements, or 'all' for everything",
+        "default": "all"
+    },
+    "limit": {
+        "type": "integer",
+        "description": "Maximum number of results to return",
+        "default": 10
+    },
+    "offset": {
+        "type": "integer",
+        "description": "Number of results to skip (for pagination)",
+        "default": 0
+    },
+    "start_time": {
+        "type": "string",
+        "format": "date-time",
+        "description": "Start time in ISO format UTC (e.g. 2024-01-01T00:00:00Z). Filter results from this time onward."
+    },
+    "end_time": {
+        "type": "string",
+        "format": "date-time",
+        "description": "End time in ISO format UTC (e.g. 2024-01-01T00:00:00Z). Filter results up to this time."
+    },
+    "app_name": {
+        "type": "string",
+        "description": "Filter by application name (e.g. 'Chrome', 'Safari', 'Terminal')"
+    },
+    "window_name": {
+        "type": "string",
+        "description": "Filter by window name or title"
+    },
+    "min_length": {
+        "type": "integer",
+        "description": "Minimum content length in characters"
+    },
+    "max_length": {
+        "type": "integer",
+        "description": "Maximum content length in characters"
+    },
+    "dedup": {
+        "type": "boolean",
+        "description": "Collapse near-identical OCR/UI captures of the same screen into one entry with a repeat count",
+        "default": True
+    },
+    "dedup_window_minutes": {
+        "type": "number",
+        "description": f"Only collapse near-duplicates captured within this many minutes of each other (default: {DEFAULT_DEDUP_WINDOW_MINUTES})",
+        "default": DEFAULT_DEDUP_WINDOW_MINUTES
+    }
+}
+
+TOOLS = [
+    # Search
+    ToolSpec(
+        name="search-content",
+        group="search",
+        handler="screenpipe_search_tools:search_content",
+        description=(
+            "Search through screenpipe recorded content (OCR text, audio transcriptions, UI elements). "
+            "Use this to find specific content that has appeared on your screen or been spoken. "
+            "Results include timestamps, app context, and the content itself."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                **SEARCH_QUERY_PROPERTIES,
+                "cursor": {
+                    "type": "string",
+                    "description": (
+                        "Continuation cursor from a previous search-content result for the same query. "
+                        "Only frames newer than the cursor are returned, oldest first up to limit"
+                    )
+                }
+            }
+        },
+    ),
+    ToolSpec(
+        name="batch-search",
+        group="search",
+        handler="screenpipe_search_tools:batch_search",
+        description=(
+            "Run several search-content queries in one call (e.g. a person, a project and a ticket ID). "
+            "Queries run concurrently and results come back grouped per query with timing."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "queries": {
+                    "type": "array",
+                    "description": f"Query objects taking the same parameters as search-content (at most {MAX_BATCH_QUERIES})",
+                    "minItems": 1,
+                    "maxItems": MAX_BATCH_QUERIES,
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "label": {
+                                "type": "string",
+                                "description": "Optional name for this query in the output"
+                            },
+                            **SEARCH_QUERY_PROPERTIES
+                        }
+                    }
+                }
+            },
+            "required": ["queries"]
+        },
+    ),
+
+    # Strategy Agents analytics
+    ToolSpec(
+        name="analyze-productivity",
+        group="analytics",
+        handler="screenpipe_analytics_tools:analyze_productivity",
+        description=(
+            "Analyze productivity patterns from screenpipe data. "
+            "Returns time-weighted screen time per app, focus time, and work patterns."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "hours_back": {
+                    "type": "integer",
+                    "description": "Number of hours to analyze (default: 8)",
+                    "default": 8
+                },
+                "focus_apps": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of apps considered as 'focus work' (e.g. ['VSCode', 'Terminal', 'Linear'])",
+                    "default": ["VSCode", "Code", "Terminal", "Linear", "Notion"]
+                },
+                "idle_cap_seconds": {
+                    "type": "integer",
+                    "description": f"Longest gap between frames still counted as time in the app (default: {DEFAULT_IDLE_CAP_SECONDS})",
+                    "default": DEFAULT_IDLE_CAP_SECONDS
+                }
+            }
+        }
+    ),
+    ToolSpec(
+        name="find-coding-sessions",
+        group="analytics",
+        handler="screenpipe_analytics_tools:find_coding_sessions",
+        description=(
+            "Find recent coding or development work sessions based on screen activity. "
+            "Groups VS Code, terminal, IDE activity into sessions split by idle gaps, "
+            "with duration, dominant app, window titles and detected project for each."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "hours_back": {
+                    "type": "integer",
+                    "description": "Number of hours to look back (default: 24)",
+                    "default": 24
+                },
+                "language": {
+                    "type": "string",
+                    "description": "Programming language to focus on (optional)"
+                },
+                "project": {
+                    "type": "string",
+                    "description": "Project name or path to focus on (optional)"
+                },
+                "idle_gap_minutes": {
+                    "type": "integer",
+                    "description": f"Minutes of inactivity that end a session (default: {DEFAULT_IDLE_GAP_MINUTES})",
+                    "default": DEFAULT_IDLE_GAP_MINUTES
+                }
+            }
+        }
+    ),
+    ToolSpec(
+        name="export-daily-summary",
+        group="analytics",
+        handler="screenpipe_analytics_tools:export_daily_summary",
+        description=(
+            "Export a comprehensive daily summary of activities to data directory. "
+            "Includes productivity metrics, app usage, and key activities."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "date": {
+                    "type": "string",
+                    "description": "Date to export (YYYY-MM-DD format, default: today)"
+                },
+                "format": {
+                    "type": "string",
+                    "enum": ["json", "markdown", "csv"],
+                    "description": "Export format",
+                    "default": "json"
+                }
+            }
+        }
+    ),
+
+    # Server and Screenpipe status
+    ToolSpec(
+        name="server-metrics",
+        group="status",
+        handler="screenpipe_status_tools:server_metrics",
+        description=(
+            "Report per-tool call counts, latency percentiles (p50/p95/p99), time spent in upstream "
+            "screenpipe requests, payload sizes and error counts for this MCP server, plus the state "
+            "of its search cache and local index."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "dump": {
+                    "type": "boolean",
+                    "description": f"Also write the metrics as JSON to logs/{METRICS_FILENAME}",
+                    "default": False
+                },
+                "reset": {
+                    "type": "boolean",
+                    "description": "Clear all counters after reporting",
+                    "default": False
+                }
+            }
+        }
+    ),
+    ToolSpec(
+        name="test-connection",
+        group="status",
+        handler="screenpipe_status_tools:test_connection",
+        description="Test the connection to Screenpipe API",
+        input_schema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    ToolSpec(
+        name="get-health",
+        group="status",
+        handler="screenpipe_status_tools:get_health",
+        description="Get Screenpipe service health status",
+        input_schema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+
+    # Cross-platform control tools
+    ToolSpec(
+        name="pixel-control",
+        group="control",
+        handler="screenpipe_control_tools:pixel_control",
+        description=(
+            "Control mouse and keyboard at the pixel level. This is a cross-platform tool that works on all operating systems. "
+            "Use this to type text, press keys, move the mouse, and click buttons."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "action_type": {
+                    "type": "string",
+                    "enum": ["WriteText", "KeyPress", "MouseMove", "MouseClick"],
+                    "description": "Type of input action to perform",
+                },
+                "data": {
+                    "oneOf": [
+                        {
+                            "type": "string",
+                            "description": "Text to type or key to press (for WriteText and KeyPress)",
+                        },
+                        {
+                            "type": "object",
+                            "properties": {
+                                "x": {"type": "integer", "description": "X coordinate for mouse movement"},
+                                "y": {"type": "integer", "description": "Y coordinate for mouse movement"},
+                            },
+                            "description": "Coordinates for MouseMove",
+                        },
+                        {
+                            "type": "string",
+                            "enum": ["left", "right", "middle"],
+                            "description": "Button to click for MouseClick",
+                        },
+                    ],
+                    "description": "Action-specific data",
+                },
+            },
+            "required": ["action_type", "data"]
+        },
+    ),
+
+    # MacOS-specific control tools
+    ToolSpec(
+        name="open-application",
+        group="control",
+        handler="screenpipe_control_tools:open_application",
+        description="Open an application by name",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "app_name": {
+                    "type": "string",
+                    "description": "The name of the application to open"
+                }
+            },
+            "required": ["app_name"]
+        },
+        platforms=("Darwin",),
+    ),
+    ToolSpec(
+        name="open-url",
+        group="control",
+        handler="screenpipe_control_tools:open_url",
+        description="Open a URL in a browser",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "The URL to open"
+                },
+                "browser": {
+                    "type": "string",
+                    "description": "The browser to use (optional)"
+                }
+            },
+            "required": ["url"]
+        },
+        platforms=("Darwin",),
+    ),
+
+    # Terminal control
+    ToolSpec(
+        name="execute-terminal-command",
+        group="terminal",
+        handler="screenpipe_terminal_tools:execute_command",
+        description=(
+            "Execute a shell command and return its output. Commands run in a persistent shell session, "
+            "so the working directory and environment carry over between calls of the same session. "
+            "Very long output is cut to its beginning and end, with the path of a file holding all of it. "
+            "Use this for running scripts, starting applications, or any terminal operations."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "The command to execute in the terminal"
+                },
+                "timeout": {
+                    "type": "integer",
+                    "description": "Timeout in seconds (default: 120)",
+                    "default": 120
+                },
+                "session": {
+                    "type": "string",
+                    "description": (
+                        "Name of the persistent shell session to run in (default: 'default'). The working "
+                        "directory and environment carry over between commands of a session; commands in "
+                        "the same session run one at a time, so use different names to run commands in parallel"
+                    ),
+                    "default": "default"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    ToolSpec(
+        name="start-job",
+        group="terminal",
+        handler="screenpipe_terminal_tools:start_job",
+        description=(
+            "Start a long-running shell command (build, test run, server) in the background and return its job ID "
+            "immediately. Poll its output with job-output and its state with job-status; stop it with job-cancel."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "The shell command to run"
+                },
+                "cwd": {
+                    "type": "string",
+                    "description": "Working directory for the command (optional)"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Seconds after which the job is killed (optional, default: no limit)"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    ToolSpec(
+        name="job-output",
+        group="terminal",
+        handler="screenpipe_terminal_tools:job_output",
+        description=(
+            "Read a background job's combined stdout/stderr from a byte offset. Pass the returned next offset "
+            "on the following call to get only new output. Only the most recent output of each job is kept."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID returned by start-job"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Byte offset to read from (default: 0); negative values read that many bytes back from the end",
+                    "default": 0
+                },
+                "max_bytes": {
+                    "type": "integer",
+                    "description": f"Most bytes to return (default: {DEFAULT_JOB_READ_BYTES})",
+                    "default": DEFAULT_JOB_READ_BYTES
+                }
+            },
+            "required": ["job_id"]
+        }
+    ),
+    ToolSpec(
+        name="job-status",
+        group="terminal",
+        handler="screenpipe_terminal_tools:job_status",
+        description="Show the state, exit code, runtime and output size of one background job, or of all of them",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID (optional; omit to list every job)"
+                }
+            }
+        }
+    ),
+    ToolSpec(
+        name="job-cancel",
+        group="terminal",
+        handler="screenpipe_terminal_tools:job_cancel",
+        description="Stop a background job, terminating its whole process group",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID returned by start-job"
+                }
+            },
+            "required": ["job_id"]
+        }
+    ),
+    ToolSpec(
+        name="send-control-character",
+        group="terminal",
+        handler="screenpipe_terminal_tools:send_control",
+        description=(
+            "Send a control character to a background job (start-job) or to the command running in a shell "
+            "session (execute-terminal-command), as a signal to its process group only. "
+            "Supported characters: C (Ctrl-C, interrupt), Z (Ctrl-Z, suspend a job), Q (Ctrl-Q, resume a suspended job). "
+            "Without job_id or session, goes to the only job or session command running"
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "character": {
+                    "type": "string",
+                    "description": "Control character to send (C, Z, Q; D and L are accepted but have no effect without a terminal)",
+                    "enum": ["C", "Z", "Q", "D", "L"]
+                },
+                "job_id": {
+                    "type": "string",
+                    "description": "Background job to signal (optional)"
+                },
+                "session": {
+                    "type": "string",
+                    "description": "Shell session whose running command to signal (optional)"
+                }
+            },
+            "required": ["character"]
+        }
+    ),
+    ToolSpec(
+        name="start-repl",
+        group="terminal",
+        handler="screenpipe_terminal_tools:start_repl",
+        description=(
+            "Start a REPL (Read-Eval-Print Loop) in the terminal. "
+            "Supports Python, Node.js, and other interpreters."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "language": {
+                    "type": "string",
+                    "description": "Programming language for REPL",
+                    "enum": ["python", "python3", "node", "nodejs", "ipython", "bash", "zsh"]
+                }
+            },
+            "required": ["language"]
+        }
+    ),
+]
+
+
+def parse_groups(value: str) -> list[str]:
+    """Parse --tool-groups ("search,analytics" or "all")"""
+    groups = [group.strip() for group in value.split(",") if group.strip()]
+    if "all" in groups:
+        return list(TOOL_GROUPS)
+    unknown = [group for group in groups if group not in TOOL_GROUPS]
+    if unknown:
+        raise ValueError(f"unknown tool group(s): {', '.join(unknown)} (expected: {', '.join(TOOL_GROUPS)} or all)")
+    return groups